@@ -90,6 +90,15 @@ function j4status
     else
         echo "  ⚠️ Não encontrado"
     end
+    echo ""
+    echo "📦 Repositórios git:"
+    if test -f ~/.J.4.R.V.1.5/01_saas_foundry/tools/j4git.py
+        echo "  • "(python3 ~/.J.4.R.V.1.5/01_saas_foundry/tools/j4git.py --summary)
+    end
+end
+
+function j4git
+    python3 ~/.J.4.R.V.1.5/01_saas_foundry/tools/j4git.py $argv
 end
 
 function j4tree
@@ -112,6 +121,14 @@ function j4validate
     end
 end
 
+# ============================================
+# BUSCA
+# ============================================
+
+function j4find
+    python3 ~/.J.4.R.V.1.5/01_saas_foundry/tools/j4find.py $argv
+end
+
 # ============================================
 # GERENCIAMENTO DE SECRETS
 # ============================================
@@ -184,6 +201,14 @@ function j4restore
     end
 end
 
+function j4new
+    python3 ~/.J.4.R.V.1.5/01_saas_foundry/tools/j4scaffold.py $argv
+end
+
+function j4tier
+    python3 ~/.J.4.R.V.1.5/01_saas_foundry/tools/j4tier.py $argv
+end
+
 # ============================================
 # AJUDA E DOCUMENTAÇÃO
 # ============================================
@@ -214,6 +239,11 @@ function j4help
     echo "  j4status    → Ver status do sistema"
     echo "  j4tree      → Visualizar árvore de diretórios"
     echo "  j4validate  → Validar estrutura"
+    echo "  j4git       → Status dos repositórios git do workspace"
+    echo ""
+    echo "🔎 BUSCA:"
+    echo "  j4find <termos>       → Buscar em 30_knowledge"
+    echo "  j4find --name <nome>  → Buscar por nome de arquivo"
     echo ""
     echo "🔐 SECRETS:"
     echo "  j4secrets-init → Inicializar 60_secrets"
@@ -222,6 +252,10 @@ function j4help
     echo "💾 BACKUP:"
     echo "  j4backup    → Criar backup"
     echo "  j4restore   → Restaurar backup"
+    echo "  j4new <template> <projeto> → Criar projeto a partir de 50_templates"
+    echo "  j4tier scan|pack       → Arquivar projetos frios de 20_workspace"
+    echo "  j4tier ls|cat <stub>   → Ler bundle sem extrair"
+    echo "  j4tier hydrate <stub>  → Restaurar projeto arquivado"
     echo ""
     echo "📖 AJUDA:"
     echo "  j4help      → Mostrar esta ajuda"
@@ -51,6 +51,8 @@ pip install --user --quiet rich psutil 2>/dev/null || true
 
 echo -e "${BLUE}[2/5] Criando estrutura Core...${NC}"
 python3 scripts/j4rv15_brutalist.py --init
+cp scripts/*.py scripts/*.sh ~/.J.4.R.V.1.5/01_saas_foundry/tools/
+cp -r scripts/templates ~/.J.4.R.V.1.5/01_saas_foundry/tools/
 
 echo -e "${BLUE}[3/5] Configurando Fish functions...${NC}"
 if [ -d ~/.config/fish/conf.d ]; then
@@ -0,0 +1,342 @@
+#!/usr/bin/env python3
+"""
+j4find - Busca full-text e por nome de arquivo em 30_knowledge .J.4.R.V.1.5.
+Versão: 5.0.0
+
+O índice invertido (termos -> documentos) e o índice de trigramas dos nomes
+de arquivo ficam em um SQLite em 00_.local/state/j4find.db. Cada busca
+atualiza o índice incrementalmente, reindexando só arquivos cujo mtime ou
+tamanho mudou; a reconstrução completa é feita em streaming, arquivo a
+arquivo, com memória limitada ao vocabulário de um único documento.
+"""
+
+import os
+import re
+import sys
+import json
+import math
+import sqlite3
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+VERSION = "5.0.0"
+
+J4RV15_ROOT = Path.home() / ".J.4.R.V.1.5"
+INDEX_PATH = Path("00_.local") / "state" / "j4find.db"
+KNOWLEDGE_DIR = "30_knowledge"
+
+MAX_FILE_SIZE = 10 * 1024 * 1024
+COMMIT_EVERY = 500
+# Segundos que um j4find espera pelo lock de escrita de outro (buscas simultâneas)
+BUSY_TIMEOUT = 60
+
+# Parâmetros do BM25
+BM25_K1 = 1.2
+BM25_B = 0.75
+NAME_MATCH_BOOST = 2.0
+
+TOKEN_RE = re.compile(r"\w{2,}", re.UNICODE)
+
+# Incrementar ao mudar o SCHEMA: índices de versões anteriores são recriados
+SCHEMA_VERSION = 2
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS docs (
+    id INTEGER PRIMARY KEY,
+    path TEXT UNIQUE NOT NULL,
+    name TEXT NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    length INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS postings (
+    term TEXT NOT NULL,
+    doc_id INTEGER NOT NULL,
+    tf INTEGER NOT NULL,
+    PRIMARY KEY (term, doc_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS postings_doc ON postings (doc_id);
+CREATE TABLE IF NOT EXISTS name_trigrams (
+    trigram TEXT NOT NULL,
+    doc_id INTEGER NOT NULL,
+    PRIMARY KEY (trigram, doc_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS name_trigrams_doc ON name_trigrams (doc_id);
+"""
+
+DROP_SCHEMA = """
+DROP TABLE IF EXISTS postings;
+DROP TABLE IF EXISTS name_trigrams;
+DROP TABLE IF EXISTS docs;
+DROP TABLE IF EXISTS meta;
+"""
+
+
+def tokenize(text: str) -> List[str]:
+    return TOKEN_RE.findall(text.lower())
+
+
+def trigrams(name: str, pad: bool = True) -> set:
+    text = name.lower()
+    if pad or len(text) < 3:
+        text = f"  {text} "
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+def _is_text(path: Path) -> bool:
+    try:
+        with open(path, "rb") as f:
+            return b"\0" not in f.read(8192)
+    except OSError:
+        return False
+
+
+class KnowledgeIndex:
+    """Índice invertido persistente sobre 30_knowledge."""
+
+    def __init__(self, root: Path = J4RV15_ROOT, index_path: Optional[Path] = None):
+        self.root = Path(root)
+        self.corpus = self.root / KNOWLEDGE_DIR
+        self.index_path = Path(index_path) if index_path else self.root / INDEX_PATH
+        self.index_path.parent.mkdir(parents=True, exist_ok=True)
+        self.db = sqlite3.connect(str(self.index_path), timeout=BUSY_TIMEOUT)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        if self.db.execute("PRAGMA user_version").fetchone()[0] != SCHEMA_VERSION:
+            self._migrate()
+
+    def _migrate(self) -> None:
+        """Recria o schema sob o lock de escrita, revalidando a versão (outro
+        processo pode ter acabado de migrar e começado a indexar)."""
+        with self.db:
+            self.db.execute("BEGIN IMMEDIATE")
+            if self.db.execute("PRAGMA user_version").fetchone()[0] != SCHEMA_VERSION:
+                for statement in (DROP_SCHEMA + SCHEMA).split(";"):
+                    if statement.strip():
+                        self.db.execute(statement)
+                self.db.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+    def close(self) -> None:
+        self.db.close()
+
+    def _walk(self) -> Iterator[Tuple[Path, os.stat_result]]:
+        for root, dirs, files in os.walk(self.corpus):
+            dirs[:] = [d for d in dirs if not d.startswith(".")]
+            for file_name in files:
+                if file_name.startswith("."):
+                    continue
+                path = Path(root) / file_name
+                try:
+                    st = path.stat()
+                except OSError:
+                    continue
+                yield path, st
+
+    def _index_document(self, doc_id: Optional[int], path: Path, st: os.stat_result) -> None:
+        """(Re)indexa um arquivo, lendo linha a linha."""
+        counts = Counter()
+        if st.st_size <= MAX_FILE_SIZE and _is_text(path):
+            with open(path, "r", encoding="utf-8", errors="replace") as f:
+                for line in f:
+                    counts.update(tokenize(line))
+        length = sum(counts.values())
+        rel = str(path.relative_to(self.corpus))
+
+        if doc_id is None:
+            cursor = self.db.execute(
+                "INSERT INTO docs (path, name, mtime_ns, size, length) VALUES (?, ?, ?, ?, ?)",
+                (rel, path.name, st.st_mtime_ns, st.st_size, length)
+            )
+            doc_id = cursor.lastrowid
+        else:
+            self.db.execute("DELETE FROM postings WHERE doc_id = ?", (doc_id,))
+            self.db.execute("DELETE FROM name_trigrams WHERE doc_id = ?", (doc_id,))
+            self.db.execute(
+                "UPDATE docs SET mtime_ns = ?, size = ?, length = ? WHERE id = ?",
+                (st.st_mtime_ns, st.st_size, length, doc_id)
+            )
+
+        self.db.executemany(
+            "INSERT INTO postings (term, doc_id, tf) VALUES (?, ?, ?)",
+            ((term, doc_id, tf) for term, tf in counts.items())
+        )
+        self.db.executemany(
+            "INSERT INTO name_trigrams (trigram, doc_id) VALUES (?, ?)",
+            ((tri, doc_id) for tri in trigrams(rel))
+        )
+
+    def update(self, rebuild: bool = False) -> Dict[str, int]:
+        """Sincroniza o índice com o disco. Retorna contadores da operação.
+
+        O estado indexado é carregado de uma vez e comparado em memória: uma
+        busca sem mudanças no corpus não abre transação de escrita nenhuma.
+        Havendo mudanças, elas são aplicadas sob BEGIN IMMEDIATE, conferindo
+        cada caminho contra o banco: outro j4find pode ter indexado os mesmos
+        arquivos desde a leitura inicial.
+        """
+        stats = {"indexed": 0, "unchanged": 0, "removed": 0}
+        known = {} if rebuild else {
+            path: (mtime_ns, size)
+            for path, mtime_ns, size in self.db.execute("SELECT path, mtime_ns, size FROM docs")
+        }
+
+        changed = []
+        for path, st in self._walk():
+            rel = str(path.relative_to(self.corpus))
+            if known.pop(rel, None) == (st.st_mtime_ns, st.st_size):
+                stats["unchanged"] += 1
+            else:
+                changed.append((rel, path, st))
+        # O que sobrou em `known` não existe mais no disco
+        if not changed and not known and not rebuild:
+            return stats
+
+        with self.db:
+            self.db.execute("BEGIN IMMEDIATE")
+            if rebuild:
+                self.db.execute("DELETE FROM postings")
+                self.db.execute("DELETE FROM name_trigrams")
+                self.db.execute("DELETE FROM docs")
+
+            pending = 0
+            for rel, path, st in changed:
+                row = self.db.execute(
+                    "SELECT id, mtime_ns, size FROM docs WHERE path = ?", (rel,)
+                ).fetchone()
+                if row and row[1] == st.st_mtime_ns and row[2] == st.st_size:
+                    stats["unchanged"] += 1
+                    continue
+
+                self._index_document(row[0] if row else None, path, st)
+                stats["indexed"] += 1
+                pending += 1
+                if pending >= COMMIT_EVERY:
+                    self.db.commit()
+                    self.db.execute("BEGIN IMMEDIATE")
+                    pending = 0
+
+            for rel in known:
+                row = self.db.execute("SELECT id FROM docs WHERE path = ?", (rel,)).fetchone()
+                if row is None:
+                    continue
+                self.db.execute("DELETE FROM postings WHERE doc_id = ?", row)
+                self.db.execute("DELETE FROM name_trigrams WHERE doc_id = ?", row)
+                self.db.execute("DELETE FROM docs WHERE id = ?", row)
+                stats["removed"] += 1
+        return stats
+
+    def search(self, query: str, limit: int = 20) -> List[Dict]:
+        """Busca full-text ranqueada por BM25, com bônus para nomes de arquivo."""
+        terms = list(dict.fromkeys(tokenize(query)))
+        if not terms:
+            return []
+
+        total_docs, total_length = self.db.execute("SELECT COUNT(*), COALESCE(SUM(length), 0) FROM docs").fetchone()
+        if not total_docs:
+            return []
+        avg_length = total_length / total_docs or 1
+
+        scores = Counter()
+        for term in terms:
+            rows = self.db.execute(
+                "SELECT p.doc_id, p.tf, d.length FROM postings p JOIN docs d ON d.id = p.doc_id WHERE p.term = ?",
+                (term,)
+            ).fetchall()
+            if not rows:
+                continue
+            idf = math.log(1 + (total_docs - len(rows) + 0.5) / (len(rows) + 0.5))
+            for doc_id, tf, length in rows:
+                norm = tf + BM25_K1 * (1 - BM25_B + BM25_B * length / avg_length)
+                scores[doc_id] += idf * tf * (BM25_K1 + 1) / norm
+
+        for doc_id, score in self._name_scores(query).items():
+            scores[doc_id] += NAME_MATCH_BOOST * score
+
+        return self._results(scores.most_common(limit))
+
+    def _name_scores(self, query: str) -> Dict[int, float]:
+        """Fração dos trigramas da consulta presentes no caminho de cada documento."""
+        # Sem preenchimento: a consulta pode casar em qualquer ponto do caminho
+        query_trigrams = trigrams(query.strip(), pad=False)
+        if not query.strip():
+            return {}
+        placeholders = ",".join("?" * len(query_trigrams))
+        rows = self.db.execute(
+            f"SELECT doc_id, COUNT(*) FROM name_trigrams WHERE trigram IN ({placeholders}) GROUP BY doc_id",
+            tuple(query_trigrams)
+        )
+        return {doc_id: hits / len(query_trigrams) for doc_id, hits in rows}
+
+    def search_names(self, query: str, limit: int = 20) -> List[Dict]:
+        """Busca aproximada só por nome/caminho de arquivo (índice de trigramas)."""
+        scores = Counter(self._name_scores(query))
+        return self._results(scores.most_common(limit))
+
+    def _results(self, ranked: List[Tuple[int, float]]) -> List[Dict]:
+        results = []
+        for doc_id, score in ranked:
+            row = self.db.execute("SELECT path FROM docs WHERE id = ?", (doc_id,)).fetchone()
+            if row:
+                results.append({"path": str(self.corpus / row[0]), "score": round(score, 4)})
+        return results
+
+
+def main():
+    """Função principal"""
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description='j4find - Busca em 30_knowledge'
+    )
+    parser.add_argument('query', nargs='*', help='Termos da busca')
+    parser.add_argument('--name', action='store_true',
+                        help='Buscar só por nome de arquivo (trigramas)')
+    parser.add_argument('--limit', type=int, default=20,
+                        help='Número máximo de resultados')
+    parser.add_argument('--json', action='store_true',
+                        help='Saída em JSON')
+    parser.add_argument('--no-update', action='store_true',
+                        help='Não sincronizar o índice antes da busca')
+    parser.add_argument('--rebuild', action='store_true',
+                        help='Reconstruir o índice do zero')
+    parser.add_argument('--root', default=str(J4RV15_ROOT),
+                        help='Raiz .J.4.R.V.1.5')
+
+    args = parser.parse_args()
+
+    index = KnowledgeIndex(Path(args.root))
+    try:
+        started = time.monotonic()
+        stats = None
+        if args.rebuild or not args.no_update:
+            stats = index.update(rebuild=args.rebuild)
+
+        if not args.query:
+            if stats is not None:
+                print(f"✅ Índice atualizado: {stats['indexed']} indexados, "
+                      f"{stats['unchanged']} inalterados, {stats['removed']} removidos")
+            return 0
+
+        query = " ".join(args.query)
+        if args.name:
+            results = index.search_names(query, args.limit)
+        else:
+            results = index.search(query, args.limit)
+        elapsed = time.monotonic() - started
+
+        if args.json:
+            print(json.dumps({"query": query, "elapsed": round(elapsed, 4), "results": results}, indent=2))
+        else:
+            for result in results:
+                print(f"{result['score']:8.3f}  {result['path']}")
+            if not results:
+                print("Nenhum resultado encontrado")
+        return 0
+    finally:
+        index.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,302 @@
+#!/usr/bin/env python3
+"""
+j4git - Status paralelo e em cache dos repositórios git do workspace .J.4.R.V.1.5.
+Versão: 5.0.0
+
+Descobre checkouts em 20_workspace e 01_saas_foundry/src e consulta
+dirty/ahead/behind em um pool limitado de workers. Os resultados ficam em
+cache (00_.local/cache/j4git.json) com chave nos mtimes de index, HEAD, ref
+atual, ref upstream, FETCH_HEAD e config: repositórios sem mudança nesses
+arquivos não são consultados de novo. Edições ainda não vistas pelo git
+(arquivos alterados sem `git add`/`git status`) não tocam o index; use
+--max-age ou --refresh para limitar essa defasagem (o --summary usado pelo
+j4status aplica SUMMARY_MAX_AGE por padrão).
+"""
+
+import os
+import sys
+import json
+import time
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+VERSION = "5.0.0"
+
+J4RV15_ROOT = Path.home() / ".J.4.R.V.1.5"
+WORKSPACE_DIRS = ["20_workspace", "01_saas_foundry/src"]
+CACHE_PATH = Path("00_.local") / "cache" / "j4git.json"
+
+DEFAULT_MAX_DEPTH = 4
+DEFAULT_TIMEOUT = 30
+SUMMARY_MAX_AGE = 300  # Idade máxima padrão do cache no --summary (j4status)
+SKIP_DIRS = {"node_modules", "__pycache__", ".venv", "venv", "target", "dist", "build"}
+
+
+def discover_repos(root: Path = J4RV15_ROOT, max_depth: int = DEFAULT_MAX_DEPTH) -> Iterator[Path]:
+    """Encontra checkouts (diretórios com .git) sem descer dentro deles."""
+    for workspace in WORKSPACE_DIRS:
+        base = root / workspace
+        if not base.is_dir():
+            continue
+        base_depth = len(base.parts)
+        for dir_path, dirs, files in os.walk(base):
+            current = Path(dir_path)
+            if ".git" in dirs or ".git" in files:
+                dirs[:] = []
+                yield current
+                continue
+            if len(current.parts) - base_depth >= max_depth:
+                dirs[:] = []
+                continue
+            dirs[:] = sorted(d for d in dirs if not d.startswith(".") and d not in SKIP_DIRS)
+
+
+def _git_dir(repo: Path) -> Path:
+    """Resolve o diretório git real (suporta `.git` como arquivo em worktrees/submódulos)."""
+    dot_git = repo / ".git"
+    if dot_git.is_file():
+        content = dot_git.read_text().strip()
+        if content.startswith("gitdir:"):
+            git_dir = Path(content[len("gitdir:"):].strip())
+            return git_dir if git_dir.is_absolute() else (repo / git_dir).resolve()
+    return dot_git
+
+
+def _mtime(path: Path) -> int:
+    try:
+        return path.stat().st_mtime_ns
+    except OSError:
+        return 0
+
+
+def _upstream_ref(common_dir: Path, branch: str) -> Optional[str]:
+    """Ref de rastreamento de `branch`, a partir de branch.<nome>.remote/merge do config."""
+    try:
+        lines = (common_dir / "config").read_text().splitlines()
+    except OSError:
+        return None
+
+    section = None
+    settings = {}
+    for line in lines:
+        line = line.strip()
+        if line.startswith("["):
+            section = line
+        elif section == f'[branch "{branch}"]' and "=" in line:
+            key, value = line.split("=", 1)
+            settings[key.strip().lower()] = value.strip()
+
+    remote, merge = settings.get("remote"), settings.get("merge")
+    if not remote or not merge:
+        return None
+    if remote == ".":
+        return merge  # Upstream é outro branch local
+    if merge.startswith("refs/heads/"):
+        merge = merge[len("refs/heads/"):]
+    return f"refs/remotes/{remote}/{merge}"
+
+
+def cache_key(repo: Path) -> List[int]:
+    """mtimes de index, HEAD, ref apontada por HEAD, ref upstream (ou packed-refs),
+    FETCH_HEAD e config.
+
+    A ref upstream muda sozinha em um `git push` (index, HEAD e ref local
+    ficam intactos); o config muda com `git branch -u`.
+    """
+    git_dir = _git_dir(repo)
+    common_dir = git_dir
+    commondir_file = git_dir / "commondir"
+    if commondir_file.exists():
+        common_dir = (git_dir / commondir_file.read_text().strip()).resolve()
+
+    head = git_dir / "HEAD"
+    ref_mtime = 0
+    upstream_mtime = 0
+    try:
+        head_content = head.read_text().strip()
+    except OSError:
+        head_content = ""
+    if head_content.startswith("ref:"):
+        ref = head_content[len("ref:"):].strip()
+        ref_mtime = _mtime(common_dir / ref) or _mtime(common_dir / "packed-refs")
+        if ref.startswith("refs/heads/"):
+            upstream = _upstream_ref(common_dir, ref[len("refs/heads/"):])
+            if upstream:
+                upstream_mtime = _mtime(common_dir / upstream) or _mtime(common_dir / "packed-refs")
+
+    return [_mtime(git_dir / "index"), _mtime(head), ref_mtime, upstream_mtime,
+            _mtime(common_dir / "FETCH_HEAD"), _mtime(common_dir / "config")]
+
+
+def query_status(repo: Path, timeout: int = DEFAULT_TIMEOUT) -> Dict[str, Any]:
+    """Executa um único `git status --porcelain=v2 --branch` e interpreta a saída."""
+    env = os.environ.copy()
+    env["GIT_OPTIONAL_LOCKS"] = "0"  # Não disputar index.lock com o usuário
+    env["LC_ALL"] = "C"
+    status = {"branch": None, "upstream": None, "ahead": 0, "behind": 0,
+              "changed": 0, "untracked": 0, "conflicts": 0}
+    try:
+        process = subprocess.run(
+            ["git", "-C", str(repo), "status", "--porcelain=v2", "--branch"],
+            capture_output=True, text=True, timeout=timeout, env=env
+        )
+    except subprocess.TimeoutExpired:
+        return dict(status, error=f"Tempo limite de {timeout}s excedido")
+    if process.returncode != 0:
+        return dict(status, error=process.stderr.strip())
+
+    for line in process.stdout.splitlines():
+        if line.startswith("# branch.head "):
+            status["branch"] = line.split(" ", 2)[2]
+        elif line.startswith("# branch.upstream "):
+            status["upstream"] = line.split(" ", 2)[2]
+        elif line.startswith("# branch.ab "):
+            ahead, behind = line.split()[2:4]
+            status["ahead"] = int(ahead)
+            status["behind"] = abs(int(behind))
+        elif line.startswith(("1 ", "2 ")):
+            status["changed"] += 1
+        elif line.startswith("u "):
+            status["conflicts"] += 1
+        elif line.startswith("? "):
+            status["untracked"] += 1
+
+    status["dirty"] = bool(status["changed"] or status["untracked"] or status["conflicts"])
+    return status
+
+
+class WorkspaceScanner:
+    """Consulta o status de todos os repositórios, reaproveitando o cache."""
+
+    def __init__(self, root: Path = J4RV15_ROOT, cache_path: Optional[Path] = None,
+                 workers: Optional[int] = None, max_age: Optional[float] = None):
+        self.root = Path(root)
+        self.cache_path = Path(cache_path) if cache_path else self.root / CACHE_PATH
+        self.workers = workers or min(32, (os.cpu_count() or 1) * 4)
+        self.max_age = max_age
+
+    def _load_cache(self) -> Dict[str, Any]:
+        try:
+            return json.loads(self.cache_path.read_text())
+        except (OSError, ValueError):
+            return {}
+
+    def _save_cache(self, cache: Dict[str, Any]) -> None:
+        try:
+            self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.cache_path.with_name(f".{self.cache_path.name}.{os.getpid()}.tmp")
+            tmp_path.write_text(json.dumps(cache))
+            os.replace(tmp_path, self.cache_path)
+        except OSError:
+            pass
+
+    def scan(self, refresh: bool = False) -> List[Dict[str, Any]]:
+        cache = self._load_cache()
+        now = time.time()
+        repos = list(discover_repos(self.root))
+
+        results = {}
+        stale = []
+        for repo in repos:
+            key = cache_key(repo)
+            entry = cache.get(str(repo))
+            fresh = (
+                not refresh
+                and entry is not None
+                and entry["key"] == key
+                and "error" not in entry["status"]
+                and (self.max_age is None or now - entry["checked"] <= self.max_age)
+            )
+            if fresh:
+                results[str(repo)] = dict(entry["status"], cached=True)
+            else:
+                stale.append((repo, key))
+
+        if stale:
+            with ThreadPoolExecutor(max_workers=self.workers) as pool:
+                statuses = pool.map(lambda item: query_status(item[0]), stale)
+                for (repo, key), status in zip(stale, statuses):
+                    # Chave lida antes da consulta: mudanças durante o status forçam nova consulta
+                    cache[str(repo)] = {"key": key, "checked": now, "status": status}
+                    results[str(repo)] = dict(status, cached=False)
+
+        # Remove do cache repositórios que não existem mais
+        cache = {path: entry for path, entry in cache.items() if path in results}
+        self._save_cache(cache)
+
+        return [dict(results[str(repo)], repo=str(repo.relative_to(self.root))) for repo in repos]
+
+
+def format_table(results: List[Dict[str, Any]]) -> str:
+    width = max([len(r["repo"]) for r in results] + [len("REPO")])
+    lines = [f"{'REPO':<{width}}  {'BRANCH':<20}  {'STATE':<8}  AHEAD  BEHIND"]
+    for r in results:
+        if "error" in r:
+            state = "ERROR"
+        elif r["dirty"]:
+            state = "dirty"
+        else:
+            state = "clean"
+        lines.append(f"{r['repo']:<{width}}  {(r['branch'] or '-'):<20}  {state:<8}  "
+                     f"{r['ahead']:>5}  {r['behind']:>6}")
+    return "\n".join(lines)
+
+
+def main():
+    """Função principal"""
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description='j4git - Status dos repositórios git do workspace'
+    )
+    parser.add_argument('--json', action='store_true',
+                        help='Saída em JSON')
+    parser.add_argument('--summary', action='store_true',
+                        help='Apenas uma linha de resumo (usado pelo j4status)')
+    parser.add_argument('--dirty', action='store_true',
+                        help='Mostrar só repositórios sujos, adiantados ou atrasados')
+    parser.add_argument('--refresh', action='store_true',
+                        help='Ignorar o cache e consultar todos os repositórios')
+    parser.add_argument('--max-age', type=float, default=None,
+                        help='Idade máxima (s) de uma entrada do cache, mesmo sem mudanças '
+                             f'(padrão: sem limite; {SUMMARY_MAX_AGE}s com --summary)')
+    parser.add_argument('--workers', type=int, default=None,
+                        help='Número máximo de consultas git simultâneas')
+    parser.add_argument('--root', default=str(J4RV15_ROOT),
+                        help='Raiz .J.4.R.V.1.5')
+
+    args = parser.parse_args()
+
+    max_age = args.max_age
+    if max_age is None and args.summary:
+        max_age = SUMMARY_MAX_AGE
+    scanner = WorkspaceScanner(Path(args.root), workers=args.workers, max_age=max_age)
+    results = scanner.scan(refresh=args.refresh)
+
+    if args.summary:
+        dirty = sum(1 for r in results if r.get("dirty"))
+        ahead = sum(1 for r in results if r["ahead"])
+        behind = sum(1 for r in results if r["behind"])
+        errors = sum(1 for r in results if "error" in r)
+        line = f"{len(results)} repositórios, {dirty} sujos, {ahead} adiantados, {behind} atrasados"
+        if errors:
+            line += f", {errors} com erro"
+        print(line)
+        return 0
+
+    if args.dirty:
+        results = [r for r in results if r.get("dirty") or r["ahead"] or r["behind"] or "error" in r]
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    elif results:
+        print(format_table(results))
+    else:
+        print("Nenhum repositório encontrado")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
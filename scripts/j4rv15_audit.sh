@@ -4,6 +4,13 @@
 # Compatível com POSIX /bin/sh
 # Modo: Somente leitura, não destrutivo
 
+# Preferir o coletor nativo (sem fork de processos externos) quando disponível.
+# Defina J4RV15_AUDIT_LEGACY=1 para forçar a auditoria em shell abaixo.
+COLLECTOR="$(dirname "$0")/j4rv15_collector.py"
+if [ -z "$J4RV15_AUDIT_LEGACY" ] && [ -f "$COLLECTOR" ] && command -v python3 > /dev/null 2>&1; then
+    exec python3 "$COLLECTOR" --log "$@"
+fi
+
 # Gera timestamp para o nome do arquivo de log
 TIMESTAMP=$(date +"%Y%m%d_%H%M%S")
 LOG_FILE="$HOME/J4RV15_audit_${TIMESTAMP}.txt"
@@ -22,6 +22,8 @@ from dataclasses import dataclass
 from enum import Enum
 from contextlib import contextmanager
 
+from j4scaffold import ScaffoldEngine
+
 # Configuração de segurança
 UMASK_SECURE = 0o077
 os.umask(UMASK_SECURE)
@@ -39,6 +41,11 @@ logger = logging.getLogger('J4RV15.v7')
 
 J4RV15_ROOT = Path.home() / ".J.4.R.V.1.5"  # Exatamente assim!
 
+VERSION = "7.0.0"
+
+# Templates dos scripts gerados em 01_saas_foundry/tools/
+TOOLS_TEMPLATE_DIR = Path(__file__).resolve().parent / "templates" / "tools"
+
 CANONICAL_STRUCTURE = {
     "00_.local": {
         "purpose": "XDG-Style Local Data",
@@ -372,90 +379,15 @@ class J4RV15BrutalistSystem:
         tools_dir = self.root / "01_saas_foundry" / "tools"
         tools_dir.mkdir(parents=True, exist_ok=True)
         
-        # j4rv15_core.py - Módulo base
-        core_content = '''#!/usr/bin/env python3
-"""J4RV15 Core - Constantes e configurações base"""
-
-from pathlib import Path
-
-# Raiz do J4RV15 - EXATAMENTE como especificado
-J4RV15_ROOT = Path.home() / ".J.4.R.V.1.5"
-
-# Versão
-VERSION = "7.0.0"
-
-# Estrutura canônica
-CANONICAL_DIRS = [
-    "00_.local",
-    "00_logs",
-    "01_saas_foundry",
-    "10_configs",
-    "20_workspace",
-    "30_knowledge",
-    "40_infrastructure",
-    "50_templates",
-    "60_secrets",
-    "70_media",
-    "80_bin",
-    "90_tmp",
-    "99_archive"
-]
-
-# Diretórios que precisam permissões especiais
-SECURE_DIRS = {
-    "60_secrets": 0o700,
-    "60_secrets/.ssh": 0o700,
-    "60_secrets/.gpg": 0o700,
-    "60_secrets/.env.d": 0o700,
-}
-
-print(f"J4RV15 Core v{VERSION} - Root: {J4RV15_ROOT}")
-'''
-        
-        core_path = tools_dir / "j4rv15_core.py"
-        self.file_ops.atomic_write(core_path, core_content.encode(), 0o755)
-        
-        # j4rv15_validate.py - Validação
-        validate_content = '''#!/usr/bin/env python3
-"""J4RV15 Validate - Validação da estrutura"""
-
-from pathlib import Path
-from j4rv15_core import J4RV15_ROOT, CANONICAL_DIRS
-
-def validate_structure():
-    """Valida se a estrutura está correta"""
-    issues = []
-    
-    if not J4RV15_ROOT.exists():
-        issues.append(f"Root não existe: {J4RV15_ROOT}")
-        return issues
-    
-    for dir_name in CANONICAL_DIRS:
-        dir_path = J4RV15_ROOT / dir_name
-        if not dir_path.exists():
-            issues.append(f"Diretório faltando: {dir_name}")
-    
-    # Verificar permissões de 60_secrets
-    secrets_dir = J4RV15_ROOT / "60_secrets"
-    if secrets_dir.exists():
-        mode = secrets_dir.stat().st_mode & 0o777
-        if mode != 0o700:
-            issues.append(f"60_secrets com permissões incorretas: {oct(mode)}")
-    
-    return issues
-
-if __name__ == "__main__":
-    issues = validate_structure()
-    if issues:
-        print("❌ Problemas encontrados:")
-        for issue in issues:
-            print(f"  • {issue}")
-    else:
-        print("✅ Estrutura validada com sucesso!")
-'''
-        
-        validate_path = tools_dir / "j4rv15_validate.py"
-        self.file_ops.atomic_write(validate_path, validate_content.encode(), 0o755)
+        # Gerados pelo mesmo motor de 50_templates (j4rv15_core.py, j4rv15_validate.py)
+        engine = ScaffoldEngine(self.root)
+        engine.instantiate(
+            TOOLS_TEMPLATE_DIR,
+            tools_dir,
+            {"version": VERSION},
+            writer=self.file_ops.atomic_write,
+            overwrite=True
+        )
         
         logger.info(f"Scripts criados em {tools_dir}")
     
@@ -592,7 +524,7 @@ EOF
         """Gera relatório de operações"""
         return {
             "timestamp": datetime.now().isoformat(),
-            "version": "7.0.0",
+            "version": VERSION,
             "root": str(self.root),
             "created_dirs": [str(d) for d in self.created_dirs],
             "migrated_items": [(str(old), str(new)) for old, new in self.migrated_items],
@@ -0,0 +1,496 @@
+#!/usr/bin/env python3
+"""
+J4RV15 Collector - Coletor nativo de auditoria do sistema .J.4.R.V.1.5.
+Versão: 5.0.0
+
+Substitui os processos externos de j4rv15_audit.sh (lscpu, lspci, free,
+lsblk, pacman, systemctl, tree, find/ls, gpg, pass) por leituras diretas de
+/proc, /sys, do banco de pacotes e da árvore de segredos. As seções são
+coletadas em paralelo e os fatos estáticos de hardware (CPU, GPU, modelo e
+tamanho dos discos) ficam em cache por boot; pontos de montagem são lidos a
+cada execução.
+Modo: Somente leitura, não destrutivo.
+"""
+
+import os
+import sys
+import json
+import stat
+import shutil
+import struct
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from secret_manager_agent import SecretManagerAgent
+
+VERSION = "5.0.0"
+
+J4RV15_ROOT = Path.home() / ".J.4.R.V.1.5"
+HARDWARE_CACHE = Path("00_.local") / "cache" / "collector_hardware.json"
+# Incrementar ao mudar o conteúdo do cache de hardware
+HARDWARE_CACHE_FORMAT = 2
+
+PACMAN_DB = Path("/var/lib/pacman/local")
+DPKG_STATUS = Path("/var/lib/dpkg/status")
+CGROUP_SYSTEM_SLICES = [
+    Path("/sys/fs/cgroup/system.slice"),
+    Path("/sys/fs/cgroup/systemd/system.slice"),
+]
+
+PCI_IDS_PATHS = [
+    Path("/usr/share/hwdata/pci.ids"),
+    Path("/usr/share/misc/pci.ids"),
+]
+
+# Dispositivos de bloco que o lsblk listaria mas não são discos reais
+IGNORED_BLOCK_PREFIXES = ("ram", "zram", "loop")
+
+
+def _read(path, default: str = "") -> str:
+    """Lê um arquivo de texto pequeno de /proc ou /sys, sem lançar exceção."""
+    try:
+        with open(path, "r", encoding="utf-8", errors="replace") as f:
+            return f.read().strip()
+    except OSError:
+        return default
+
+
+def _boot_id() -> str:
+    return _read("/proc/sys/kernel/random/boot_id")
+
+
+# =====================================================
+# 1. HARDWARE
+# =====================================================
+
+def _cpu_model() -> str:
+    for line in _read("/proc/cpuinfo").splitlines():
+        if line.startswith("model name") or line.startswith("Model name"):
+            return line.split(":", 1)[1].strip()
+    return ""
+
+
+def _pci_names(wanted: set) -> Dict[str, str]:
+    """Resolve pares (vendor, device) para nomes usando o pci.ids local."""
+    names = {}
+    for ids_path in PCI_IDS_PATHS:
+        if not ids_path.exists():
+            continue
+        vendor = None
+        vendor_name = ""
+        with open(ids_path, "r", encoding="utf-8", errors="replace") as f:
+            for line in f:
+                if line.startswith("C "):
+                    break  # Lista de classes: não há mais fabricantes
+                if not line.strip() or line.startswith("#"):
+                    continue
+                if not line.startswith("\t"):
+                    vendor, _, vendor_name = line.strip().partition("  ")
+                elif not line.startswith("\t\t") and vendor:
+                    device, _, device_name = line.strip().partition("  ")
+                    if (vendor, device) in wanted:
+                        names[f"{vendor}:{device}"] = f"{vendor_name} {device_name}"
+        break
+    return names
+
+
+def _gpus() -> List[Dict[str, str]]:
+    gpus = []
+    pci_root = Path("/sys/bus/pci/devices")
+    try:
+        devices = sorted(pci_root.iterdir())
+    except OSError:
+        return gpus
+
+    for device in devices:
+        # Classe 0x03xxxx = controlador de vídeo (VGA, 3D, display)
+        if not _read(device / "class").startswith("0x03"):
+            continue
+        vendor = _read(device / "vendor").replace("0x", "")
+        product = _read(device / "device").replace("0x", "")
+        gpus.append({"slot": device.name, "vendor": vendor, "device": product})
+
+    names = _pci_names({(g["vendor"], g["device"]) for g in gpus})
+    for gpu in gpus:
+        gpu["name"] = names.get(f"{gpu['vendor']}:{gpu['device']}", "")
+    return gpus
+
+
+def _mounts() -> Dict[str, str]:
+    """Dispositivo -> primeiro ponto de montagem (muda a qualquer momento: nunca em cache)."""
+    mounts = {}
+    for line in _read("/proc/self/mounts").splitlines():
+        parts = line.split()
+        if len(parts) >= 2 and parts[0].startswith("/dev/"):
+            mounts.setdefault(os.path.basename(parts[0]), parts[1])
+    return mounts
+
+
+def _disks() -> List[Dict[str, Any]]:
+    """Discos e partições com modelo e tamanho, sem pontos de montagem."""
+    disks = []
+    try:
+        block_devices = sorted(os.listdir("/sys/block"))
+    except OSError:
+        return disks
+
+    for name in block_devices:
+        if name.startswith(IGNORED_BLOCK_PREFIXES):
+            continue
+        dev_path = Path("/sys/block") / name
+        sectors = int(_read(dev_path / "size", "0") or 0)
+        disk = {
+            "name": name,
+            "size_bytes": sectors * 512,
+            "type": "disk",
+            "model": _read(dev_path / "device" / "model"),
+            "partitions": []
+        }
+        try:
+            children = sorted(os.listdir(dev_path))
+        except OSError:
+            children = []
+        for child in children:
+            if (dev_path / child / "partition").exists():
+                disk["partitions"].append({
+                    "name": child,
+                    "size_bytes": int(_read(dev_path / child / "size", "0") or 0) * 512,
+                    "type": "part"
+                })
+        disks.append(disk)
+    return disks
+
+
+def _memory() -> Dict[str, int]:
+    memory = {}
+    for line in _read("/proc/meminfo").splitlines():
+        key, _, value = line.partition(":")
+        if key in ("MemTotal", "MemAvailable", "MemFree", "SwapTotal", "SwapFree"):
+            memory[key] = int(value.split()[0]) * 1024
+    return memory
+
+
+def _with_mounts(hardware: Dict[str, Any]) -> Dict[str, Any]:
+    """Acrescenta os pontos de montagem atuais aos discos (cópia; o cache fica intacto)."""
+    mounts = _mounts()
+    disks = []
+    for disk in hardware["disks"]:
+        partitions = [dict(part, mountpoint=mounts.get(part["name"])) for part in disk["partitions"]]
+        disks.append(dict(disk, mountpoint=mounts.get(disk["name"]), partitions=partitions))
+    return dict(hardware, disks=disks)
+
+
+def _static_hardware(cache_path: Path) -> Dict[str, Any]:
+    """Fatos de hardware que só mudam entre boots (CPU, GPU, modelo/tamanho dos discos).
+
+    Discos hot-plug mudam durante o boot, mas só afetam a lista até o próximo
+    boot; pontos de montagem são sempre lidos na hora.
+    """
+    boot_id = _boot_id()
+    try:
+        cached = json.loads(cache_path.read_text())
+        if boot_id and cached.get("boot_id") == boot_id and cached.get("format") == HARDWARE_CACHE_FORMAT:
+            cached["cached"] = True
+            return _with_mounts(cached)
+    except (OSError, ValueError):
+        pass
+
+    hardware = {
+        "format": HARDWARE_CACHE_FORMAT,
+        "boot_id": boot_id,
+        "cpu": {"model": _cpu_model(), "count": os.cpu_count()},
+        "gpu": _gpus(),
+        "disks": _disks()
+    }
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = cache_path.with_name(f".{cache_path.name}.{os.getpid()}.tmp")
+        tmp_path.write_text(json.dumps(hardware))
+        os.replace(tmp_path, cache_path)
+    except OSError:
+        pass
+    hardware["cached"] = False
+    return _with_mounts(hardware)
+
+
+# =====================================================
+# 2-3. PACOTES E SERVIÇOS
+# =====================================================
+
+def _packages() -> Dict[str, Any]:
+    if PACMAN_DB.is_dir():
+        with os.scandir(PACMAN_DB) as entries:
+            count = sum(1 for e in entries if e.is_dir())
+        return {"manager": "pacman", "count": count}
+
+    if DPKG_STATUS.exists():
+        count = 0
+        with open(DPKG_STATUS, "r", encoding="utf-8", errors="replace") as f:
+            for line in f:
+                if line.startswith("Status:") and line.rstrip().endswith(" installed"):
+                    count += 1
+        return {"manager": "dpkg", "count": count}
+
+    return {"manager": None, "count": 0}
+
+
+def _cgroup_populated(cgroup: Path) -> bool:
+    """True se o cgroup ou algum descendente tem processos (cgroup v2: cgroup.events)."""
+    for line in _read(cgroup / "cgroup.events").splitlines():
+        if line.startswith("populated "):
+            return line.split()[1] == "1"
+    # cgroup v1: sem cgroup.events, olhar os processos da subárvore
+    for root, dirs, files in os.walk(cgroup):
+        if _read(Path(root) / "cgroup.procs"):
+            return True
+    return False
+
+
+def _running_services() -> List[str]:
+    """Serviços systemd com processos vivos, lidos da hierarquia de cgroups.
+
+    Instâncias de templates (getty@tty1.service, postgresql@16-main.service)
+    ficam em slices aninhadas como system-getty.slice/, então a busca desce
+    em todas as *.slice.
+    """
+    for slice_dir in CGROUP_SYSTEM_SLICES:
+        if not slice_dir.is_dir():
+            continue
+        services = []
+        pending = [slice_dir]
+        while pending:
+            with os.scandir(pending.pop()) as entries:
+                for entry in entries:
+                    if not entry.is_dir(follow_symlinks=False):
+                        continue
+                    if entry.name.endswith(".slice"):
+                        pending.append(Path(entry.path))
+                    elif entry.name.endswith(".service") and _cgroup_populated(Path(entry.path)):
+                        services.append(entry.name)
+        return sorted(services)
+    return []
+
+
+# =====================================================
+# 4-6. SEGREDOS
+# =====================================================
+
+def _secrets(secrets_dir: Path) -> Dict[str, Any]:
+    """Estrutura, permissões e inconsistências de 60_secrets em uma única varredura."""
+    if not secrets_dir.is_dir():
+        return {"found": False, "path": str(secrets_dir)}
+
+    agent = SecretManagerAgent(str(secrets_dir))
+    result = {
+        "found": True,
+        "path": str(secrets_dir),
+        "audit": agent.run_task({"action": "audit"}),
+        "tree": [],
+        "files": [],
+        "inconsistencies": {"files": [], "directories": []}
+    }
+
+    # O próprio 60_secrets também precisa de 700 (como no `find -type d` legado)
+    try:
+        mode = stat.S_IMODE(secrets_dir.stat().st_mode)
+        if mode != 0o700:
+            result["inconsistencies"]["directories"].append({"path": str(secrets_dir), "mode": oct(mode)})
+    except OSError:
+        pass
+
+    base_depth = len(secrets_dir.parts)
+    for root, dirs, files in os.walk(secrets_dir):
+        root_path = Path(root)
+        depth = len(root_path.parts) - base_depth
+        for dir_name in dirs:
+            dir_path = root_path / dir_name
+            if depth < 2:
+                result["tree"].append(str(dir_path.relative_to(secrets_dir)))
+            try:
+                mode = stat.S_IMODE(dir_path.lstat().st_mode)
+            except OSError:
+                continue
+            if not dir_path.is_symlink() and mode != 0o700:
+                result["inconsistencies"]["directories"].append({"path": str(dir_path), "mode": oct(mode)})
+        for file_name in files:
+            file_path = root_path / file_name
+            try:
+                st = file_path.lstat()
+            except OSError:
+                continue
+            result["files"].append({"path": str(file_path), "mode": stat.filemode(st.st_mode)})
+            if stat.S_ISREG(st.st_mode) and stat.S_IMODE(st.st_mode) != 0o600:
+                result["inconsistencies"]["files"].append({"path": str(file_path), "mode": oct(stat.S_IMODE(st.st_mode))})
+
+    return result
+
+
+# =====================================================
+# 7-9. AMBIENTE GRÁFICO, GPG E PASS
+# =====================================================
+
+def _graphical() -> Dict[str, Optional[str]]:
+    if os.environ.get("WAYLAND_DISPLAY"):
+        return {"environment": "Wayland", "display": os.environ["WAYLAND_DISPLAY"]}
+    if os.environ.get("DISPLAY"):
+        return {"environment": "X11", "display": os.environ["DISPLAY"]}
+    return {"environment": "TTY", "display": None}
+
+
+def _parse_keybox(data: bytes) -> List[Dict[str, Any]]:
+    """Extrai fingerprints e user IDs dos blobs OpenPGP de um pubring.kbx."""
+    keys = []
+    offset = 0
+    while offset + 20 <= len(data):
+        blob_len = struct.unpack_from(">I", data, offset)[0]
+        if blob_len < 20 or offset + blob_len > len(data):
+            break
+        blob = data[offset:offset + blob_len]
+        offset += blob_len
+        if blob[4] != 2:  # 1 = cabeçalho, 2 = OpenPGP, 3 = X.509
+            continue
+
+        nkeys, keyinfo_size = struct.unpack_from(">HH", blob, 16)
+        pos = 20
+        fingerprints = []
+        for _ in range(nkeys):
+            fingerprints.append(blob[pos:pos + 20].hex().upper())
+            pos += keyinfo_size
+
+        serial_size = struct.unpack_from(">H", blob, pos)[0]
+        pos += 2 + serial_size
+        nuids, uidinfo_size = struct.unpack_from(">HH", blob, pos)
+        pos += 4
+        uids = []
+        for _ in range(nuids):
+            uid_off, uid_len = struct.unpack_from(">II", blob, pos)
+            uids.append(blob[uid_off:uid_off + uid_len].decode("utf-8", errors="replace"))
+            pos += uidinfo_size
+
+        keys.append({"fingerprint": fingerprints[0] if fingerprints else "",
+                     "subkeys": fingerprints[1:], "uids": uids})
+    return keys
+
+
+def _gpg() -> Dict[str, Any]:
+    gnupg_home = Path(os.environ.get("GNUPGHOME", Path.home() / ".gnupg"))
+    result = {"home": str(gnupg_home), "format": None, "public_keys": [], "secret_keys": 0}
+
+    private_dir = gnupg_home / "private-keys-v1.d"
+    if private_dir.is_dir():
+        result["secret_keys"] = sum(1 for p in private_dir.iterdir() if p.suffix == ".key")
+
+    keybox = gnupg_home / "pubring.kbx"
+    if (gnupg_home / "public-keys.d" / "pubring.db").exists():
+        result["format"] = "keyboxd"
+    elif keybox.exists():
+        result["format"] = "keybox"
+        try:
+            result["public_keys"] = _parse_keybox(keybox.read_bytes())
+        except (OSError, struct.error, IndexError) as e:
+            result["error"] = str(e)
+    elif (gnupg_home / "pubring.gpg").exists():
+        result["format"] = "legacy"
+    return result
+
+
+def _pass_store(root: Path) -> Dict[str, Any]:
+    store = os.environ.get("PASSWORD_STORE_DIR")
+    store_path = Path(store) if store else root / "60_secrets" / ".password-store"
+    result = {
+        "installed": shutil.which("pass") is not None,
+        "store": str(store_path),
+        "initialized": (store_path / ".gpg-id").exists(),
+        "entries": []
+    }
+    if store_path.is_dir():
+        for dirpath, dirs, files in os.walk(store_path):
+            dirs[:] = [d for d in dirs if not d.startswith(".")]
+            for file_name in files:
+                if file_name.endswith(".gpg"):
+                    entry = Path(dirpath, file_name).relative_to(store_path)
+                    result["entries"].append(str(entry)[:-len(".gpg")])
+        result["entries"].sort()
+    return result
+
+
+# =====================================================
+# COLETOR
+# =====================================================
+
+class SystemCollector:
+    """Coleta todas as seções da auditoria em paralelo, em um único processo."""
+
+    def __init__(self, root: Path = J4RV15_ROOT, cache_path: Optional[Path] = None):
+        self.root = Path(root)
+        self.cache_path = Path(cache_path) if cache_path else self.root / HARDWARE_CACHE
+
+    def collect(self) -> Dict[str, Any]:
+        started = time.monotonic()
+        sections = {
+            "hardware": lambda: _static_hardware(self.cache_path),
+            "memory": _memory,
+            "packages": _packages,
+            "services": _running_services,
+            "secrets": lambda: _secrets(self.root / "60_secrets"),
+            "graphical": _graphical,
+            "gpg": _gpg,
+            "pass": lambda: _pass_store(self.root),
+        }
+
+        report = {
+            "timestamp": datetime.now().isoformat(),
+            "version": VERSION,
+            "root": str(self.root),
+        }
+        with ThreadPoolExecutor(max_workers=len(sections)) as pool:
+            futures = {name: pool.submit(func) for name, func in sections.items()}
+            for name, future in futures.items():
+                try:
+                    report[name] = future.result()
+                except Exception as e:
+                    report[name] = {"error": str(e)}
+
+        report["elapsed"] = round(time.monotonic() - started, 4)
+        return report
+
+
+def main():
+    """Função principal"""
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description='J4RV15 Collector - Auditoria nativa do sistema'
+    )
+    parser.add_argument('--output', metavar='FILE',
+                        help='Salvar o relatório JSON em FILE em vez de stdout')
+    parser.add_argument('--log', action='store_true',
+                        help='Salvar em $HOME/J4RV15_audit_<timestamp>.json (como j4rv15_audit.sh)')
+    parser.add_argument('--root', default=str(J4RV15_ROOT),
+                        help='Raiz .J.4.R.V.1.5 a auditar')
+
+    args = parser.parse_args()
+
+    report = SystemCollector(Path(args.root)).collect()
+    content = json.dumps(report, indent=2, ensure_ascii=False)
+
+    output = args.output
+    if args.log and not output:
+        output = str(Path.home() / f"J4RV15_audit_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+
+    if output:
+        old_umask = os.umask(0o077)
+        try:
+            Path(output).write_text(content + "\n", encoding="utf-8")
+        finally:
+            os.umask(old_umask)
+        print(f"Auditoria concluída. Log salvo em: {output}")
+    else:
+        sys.stdout.write(content + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,400 @@
+#!/usr/bin/env python3
+"""
+j4scaffold - Motor de scaffolding para 50_templates .J.4.R.V.1.5.
+Versão: 5.0.0
+
+Templates em 50_templates/{code,configs,docs}/<nome> são pré-compilados em
+um manifesto em cache (00_.local/cache/j4scaffold): arquivos sem variáveis
+são marcados como estáticos e clonados por reflink (ou hardlink, se
+solicitado, ou cópia no kernel como último recurso); só os arquivos com
+variáveis `{{ nome }}` são renderizados. Variáveis também valem nos nomes
+de arquivos e diretórios. `\\{{ nome }}` produz o texto literal `{{ nome }}`
+(ex: `{{ end }}` de templates Go/Helm). Um destino que já tem conteúdo só é
+usado com --force.
+"""
+
+import os
+import re
+import sys
+import json
+import fcntl
+import shutil
+import getpass
+import hashlib
+import tempfile
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+VERSION = "5.0.0"
+
+J4RV15_ROOT = Path.home() / ".J.4.R.V.1.5"
+TEMPLATES_DIR = "50_templates"
+TEMPLATE_CATEGORIES = ["code", "configs", "docs"]
+CACHE_DIR = Path("00_.local") / "cache" / "j4scaffold"
+
+DESTINATIONS = {
+    "workspace": Path("20_workspace") / "current",
+    "foundry": Path("01_saas_foundry") / "src",
+}
+
+# Um `\` antes de `{{` escapa o placeholder, que é emitido literalmente sem a barra
+VARIABLE_RE = re.compile(r"(\\)?\{\{\s*([A-Za-z_][A-Za-z0-9_]*)\s*\}\}")
+
+# Incrementar ao mudar o formato do manifesto: caches antigos são recompilados
+MANIFEST_FORMAT = 2
+
+# ioctl(FICLONE) do Linux: clona o arquivo compartilhando extents (btrfs, xfs)
+FICLONE = 0x40049409
+
+LINK_MODES = ["reflink", "hardlink", "copy"]
+
+# Bytes por chamada de copy_file_range/sendfile
+KERNEL_COPY_CHUNK = 1 << 30
+
+
+class ScaffoldError(Exception):
+    """Erro ao compilar ou instanciar um template."""
+
+
+def _atomic_write(path: Path, content: bytes, mode: int = 0o644) -> None:
+    """Escrita atômica padrão (temporário no mesmo diretório + rename)."""
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(content)
+            f.flush()
+            os.fsync(f.fileno())
+            os.fchmod(f.fileno(), mode)
+        os.rename(tmp_name, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_name)
+        except OSError:
+            pass
+        raise
+
+
+def _compile_text(text: str) -> Optional[List]:
+    """Divide o texto em literais (str) e variáveis ([nome]); None se não houver placeholders."""
+    segments = []
+    position = 0
+    for match in VARIABLE_RE.finditer(text):
+        if match.start() > position:
+            segments.append(text[position:match.start()])
+        if match.group(1):
+            segments.append(match.group(0)[1:])
+        else:
+            segments.append([match.group(2)])
+        position = match.end()
+    if not segments:
+        return None
+    if position < len(text):
+        segments.append(text[position:])
+    return segments
+
+
+def _render(segments: List, variables: Dict[str, str]) -> str:
+    parts = []
+    for segment in segments:
+        if isinstance(segment, list):
+            try:
+                parts.append(str(variables[segment[0]]))
+            except KeyError:
+                raise ScaffoldError(f"Variável não definida: {segment[0]}")
+        else:
+            parts.append(segment)
+    return "".join(parts)
+
+
+def _render_path(rel: str, variables: Dict[str, str]) -> str:
+    segments = _compile_text(rel)
+    return _render(segments, variables) if segments else rel
+
+
+def _variables_in(segments: Optional[List]) -> set:
+    return {seg[0] for seg in segments or [] if isinstance(seg, list)}
+
+
+def _target(dest: Path, rel: str, variables: Dict[str, str]) -> Path:
+    """Renderiza o caminho relativo e garante que ele fica dentro de dest.
+
+    Mesma regra de SecureFileOps.validate_path: valores como `../../x` ou
+    caminhos absolutos em variáveis de caminho são recusados.
+    """
+    base = dest.resolve()
+    target = (dest / _render_path(rel, variables)).resolve()
+    try:
+        target.relative_to(base)
+    except ValueError:
+        raise ScaffoldError(f"Path traversal detectado: {target} não está em {base}")
+    return target
+
+
+def _kernel_copy(fsrc, fdst) -> None:
+    """Copia fsrc em fdst no kernel, sem passar os dados pelo espaço de usuário.
+
+    copy_file_range (que o próprio sistema de arquivos pode transformar em
+    reflink, ex: NFS 4.2) e, se não suportado entre os dois arquivos,
+    sendfile; cópia em buffer só como último recurso.
+    """
+    def sendfile(src: int, dst: int, count: int) -> int:
+        return os.sendfile(dst, src, None, count)
+
+    for copy in (getattr(os, "copy_file_range", None), sendfile):
+        if copy is None:
+            continue
+        copied = 0
+        try:
+            while True:
+                count = copy(fsrc.fileno(), fdst.fileno(), KERNEL_COPY_CHUNK)
+                if not count:
+                    return
+                copied += count
+        except OSError:
+            if copied:
+                raise  # Falha no meio da cópia: não recomeçar de outro ponto
+    shutil.copyfileobj(fsrc, fdst)
+
+
+def _place_static(src: Path, dest: Path, mode: int, link_mode: str) -> str:
+    """Coloca um arquivo estático no destino, substituindo-o atomicamente.
+
+    Retorna o método efetivamente usado (reflink, hardlink ou copy).
+    """
+    tmp_name = dest.with_name(f".{dest.name}.{os.getpid()}.tmp")
+    try:
+        if link_mode == "hardlink":
+            try:
+                os.link(src, tmp_name)
+                os.rename(tmp_name, dest)
+                return "hardlink"
+            except OSError:
+                pass
+
+        with open(src, "rb") as fsrc:
+            fd = os.open(tmp_name, os.O_WRONLY | os.O_CREAT | os.O_EXCL | os.O_NOFOLLOW, 0o600)
+            with os.fdopen(fd, "wb") as fdst:
+                method = "copy"
+                if link_mode in ("reflink", "hardlink"):
+                    try:
+                        fcntl.ioctl(fdst.fileno(), FICLONE, fsrc.fileno())
+                        method = "reflink"
+                    except OSError:
+                        pass
+                if method == "copy":
+                    _kernel_copy(fsrc, fdst)
+                os.fchmod(fdst.fileno(), mode)
+        os.rename(tmp_name, dest)
+        return method
+    except BaseException:
+        try:
+            os.unlink(tmp_name)
+        except OSError:
+            pass
+        raise
+
+
+class ScaffoldEngine:
+    """Compila templates para um cache e os instancia em projetos."""
+
+    def __init__(self, root: Path = J4RV15_ROOT, cache_dir: Optional[Path] = None):
+        self.root = Path(root)
+        self.cache_dir = Path(cache_dir) if cache_dir else self.root / CACHE_DIR
+
+    def list_templates(self) -> List[str]:
+        templates = []
+        for category in TEMPLATE_CATEGORIES:
+            category_dir = self.root / TEMPLATES_DIR / category
+            if category_dir.is_dir():
+                templates.extend(f"{category}/{p.name}" for p in sorted(category_dir.iterdir()) if p.is_dir())
+        return templates
+
+    def find_template(self, name: str) -> Path:
+        """Aceita `categoria/nome` ou apenas `nome` (busca nas categorias)."""
+        base = self.root / TEMPLATES_DIR
+        if "/" in name:
+            candidates = [base / name]
+        else:
+            candidates = [base / category / name for category in TEMPLATE_CATEGORIES]
+        for candidate in candidates:
+            if candidate.is_dir():
+                return candidate
+        raise ScaffoldError(f"Template não encontrado: {name}")
+
+    def _signature(self, template_dir: Path) -> str:
+        """Hash de (caminho, mtime, tamanho, modo) de todos os itens do template."""
+        digest = hashlib.sha256()
+        for root, dirs, files in os.walk(template_dir):
+            dirs.sort()
+            for name in sorted(dirs + files):
+                st = os.lstat(os.path.join(root, name))
+                rel = os.path.relpath(os.path.join(root, name), template_dir)
+                digest.update(f"{rel}\0{st.st_mtime_ns}\0{st.st_size}\0{st.st_mode}\n".encode())
+        return digest.hexdigest()
+
+    def compile(self, template_dir: Path) -> Dict[str, Any]:
+        """Retorna o manifesto compilado do template, usando o cache se válido."""
+        template_dir = Path(template_dir).resolve()
+        signature = self._signature(template_dir)
+        cache_key = hashlib.sha256(str(template_dir).encode()).hexdigest()[:16]
+        cache_path = self.cache_dir / f"{template_dir.name}-{cache_key}.json"
+
+        try:
+            cached = json.loads(cache_path.read_text())
+            if cached.get("signature") == signature and cached.get("format") == MANIFEST_FORMAT:
+                return cached
+        except (OSError, ValueError):
+            pass
+
+        manifest = {
+            "format": MANIFEST_FORMAT,
+            "template": str(template_dir),
+            "signature": signature,
+            "dirs": [],
+            "static": [],
+            "rendered": []
+        }
+        for root, dirs, files in os.walk(template_dir):
+            dirs.sort()
+            for dir_name in dirs:
+                manifest["dirs"].append(os.path.relpath(os.path.join(root, dir_name), template_dir))
+            for file_name in sorted(files):
+                path = Path(root) / file_name
+                rel = os.path.relpath(path, template_dir)
+                mode = path.stat().st_mode & 0o777
+                try:
+                    segments = _compile_text(path.read_text(encoding="utf-8"))
+                except UnicodeDecodeError:
+                    segments = None
+                if segments is None:
+                    manifest["static"].append({"path": rel, "mode": mode})
+                else:
+                    manifest["rendered"].append({"path": rel, "mode": mode, "segments": segments})
+
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        _atomic_write(cache_path, json.dumps(manifest).encode(), 0o644)
+        return manifest
+
+    def instantiate(self, template_dir: Path, dest: Path, variables: Dict[str, str],
+                    link_mode: str = "reflink",
+                    writer: Callable[[Path, bytes, int], None] = _atomic_write,
+                    overwrite: bool = False) -> Dict[str, Any]:
+        """Materializa o template em dest.
+
+        dest precisa não existir ou estar vazio; com overwrite=True, um dest
+        com conteúdo é aceito e os arquivos do template substituem os
+        existentes (regeneração de 01_saas_foundry/tools). `writer(path,
+        content, mode)` grava os arquivos renderizados, permitindo que
+        chamadores usem sua própria escrita segura.
+        """
+        if link_mode not in LINK_MODES:
+            raise ScaffoldError(f"Modo de link inválido: {link_mode}")
+        dest = Path(dest)
+        if dest.exists() or dest.is_symlink():
+            if not dest.is_dir():
+                raise ScaffoldError(f"Destino não é um diretório: {dest}")
+            if not overwrite and any(dest.iterdir()):
+                raise ScaffoldError(f"Destino não está vazio: {dest} (use --force para sobrescrever)")
+        manifest = self.compile(template_dir)
+        template_dir = Path(manifest["template"])
+        variables = dict(self.default_variables(dest), **variables)
+
+        # Validar todas as variáveis e caminhos de destino antes de tocar no disco
+        required = set()
+        for rel in manifest["dirs"] + [e["path"] for e in manifest["static"] + manifest["rendered"]]:
+            required.update(_variables_in(_compile_text(rel)))
+        for entry in manifest["rendered"]:
+            required.update(_variables_in(entry["segments"]))
+        missing = sorted(required - set(variables))
+        if missing:
+            raise ScaffoldError(f"Variáveis não definidas: {', '.join(missing)}")
+
+        dirs = [_target(dest, rel, variables) for rel in manifest["dirs"]]
+        static = [(entry, _target(dest, entry["path"], variables)) for entry in manifest["static"]]
+        rendered = [(entry, _target(dest, entry["path"], variables)) for entry in manifest["rendered"]]
+
+        dest.mkdir(parents=True, exist_ok=True)
+        for target in dirs:
+            target.mkdir(parents=True, exist_ok=True)
+
+        result = {"dest": str(dest), "rendered": 0, "reflink": 0, "hardlink": 0, "copy": 0}
+        for entry, target in static:
+            method = _place_static(template_dir / entry["path"], target, entry["mode"], link_mode)
+            result[method] += 1
+
+        for entry, target in rendered:
+            writer(target, _render(entry["segments"], variables).encode("utf-8"), entry["mode"])
+            result["rendered"] += 1
+
+        return result
+
+    @staticmethod
+    def default_variables(dest: Path) -> Dict[str, str]:
+        now = datetime.now()
+        return {
+            "name": dest.name,
+            "date": now.strftime("%Y-%m-%d"),
+            "year": str(now.year),
+            "user": getpass.getuser(),
+        }
+
+
+def main():
+    """Função principal"""
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description='j4scaffold - Scaffolding a partir de 50_templates'
+    )
+    parser.add_argument('template', nargs='?', help='Template (categoria/nome ou nome)')
+    parser.add_argument('project', nargs='?', help='Nome do projeto')
+    parser.add_argument('--list', action='store_true',
+                        help='Listar templates disponíveis')
+    parser.add_argument('--into', choices=sorted(DESTINATIONS), default='workspace',
+                        help='Destino: 20_workspace/current ou 01_saas_foundry/src')
+    parser.add_argument('--dest', default=None,
+                        help='Diretório de destino explícito')
+    parser.add_argument('--var', action='append', default=[], metavar='CHAVE=VALOR',
+                        help='Variável do template (repetível)')
+    parser.add_argument('--link', choices=LINK_MODES, default='reflink',
+                        help='Como colocar arquivos estáticos (hardlink compartilha o inode com o template)')
+    parser.add_argument('--force', action='store_true',
+                        help='Aceitar um destino com conteúdo, substituindo os arquivos do template')
+    parser.add_argument('--root', default=str(J4RV15_ROOT),
+                        help='Raiz .J.4.R.V.1.5')
+
+    args = parser.parse_args()
+    engine = ScaffoldEngine(Path(args.root))
+
+    if args.list:
+        for template in engine.list_templates():
+            print(template)
+        return 0
+
+    if not args.template or not (args.project or args.dest):
+        parser.error('informe o template e o nome do projeto (ou --dest)')
+
+    variables = {}
+    for spec in args.var:
+        key, sep, value = spec.partition("=")
+        if not sep:
+            parser.error(f'variável inválida: {spec}')
+        variables[key] = value
+
+    dest = Path(args.dest) if args.dest else engine.root / DESTINATIONS[args.into] / args.project
+    try:
+        result = engine.instantiate(engine.find_template(args.template), dest, variables, args.link,
+                                    overwrite=args.force)
+    except ScaffoldError as e:
+        print(f"❌ {e}", file=sys.stderr)
+        return 1
+
+    print(f"✅ Projeto criado em {result['dest']} "
+          f"({result['rendered']} renderizados, {result['reflink']} reflinks, "
+          f"{result['hardlink']} hardlinks, {result['copy']} cópias)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
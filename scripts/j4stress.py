@@ -0,0 +1,256 @@
+#!/usr/bin/env python3
+"""
+j4stress - Stress e throughput de file_lock e SecureFileOps.atomic_write.
+Versão: 5.0.0
+
+Lança processos escritores (atomic_write), leitores e "lockers" (incremento
+de contador sob file_lock) contra uma raiz .J.4.R.V.1.5 temporária, mede
+ops/s e latência de cauda e detecta violações de correção:
+- leituras rasgadas (conteúdo parcial ou checksum inválido)
+- atualizações perdidas (contador final menor que o total de incrementos)
+- arquivos .tmp remanescentes do atomic_write
+- dois processos dentro do file_lock ao mesmo tempo
+"""
+
+import os
+import sys
+import json
+import time
+import shutil
+import hashlib
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from j4rv15_brutalist import VERSION, SecureFileOps, file_lock
+
+STRESS_DIR = Path("00_.local") / "state" / "j4stress"
+
+DEFAULT_WRITERS = 4
+DEFAULT_READERS = 2
+DEFAULT_LOCKERS = 4
+DEFAULT_DURATION = 5.0
+DEFAULT_PAYLOAD = 4096
+
+
+def _percentiles(latencies: List[float]) -> Dict[str, float]:
+    if not latencies:
+        return {"p50": 0.0, "p95": 0.0, "p99": 0.0, "max": 0.0}
+    ordered = sorted(latencies)
+
+    def pick(q: float) -> float:
+        return round(ordered[min(len(ordered) - 1, int(q * len(ordered)))] * 1000, 3)
+
+    return {"p50": pick(0.50), "p95": pick(0.95), "p99": pick(0.99), "max": round(ordered[-1] * 1000, 3)}
+
+
+def _payload(writer_id: int, seq: int, size: int) -> bytes:
+    body = json.dumps({"writer": writer_id, "seq": seq, "pad": os.urandom(size // 2).hex()})
+    return json.dumps({"sha256": hashlib.sha256(body.encode()).hexdigest(), "body": body}).encode()
+
+
+def _valid_payload(content: bytes) -> bool:
+    try:
+        data = json.loads(content)
+        return hashlib.sha256(data["body"].encode()).hexdigest() == data["sha256"]
+    except (ValueError, KeyError, TypeError):
+        return False
+
+
+def _wait(start_at: float) -> float:
+    """Espera o instante de largada e devolve quando o worker realmente começou."""
+    delay = start_at - time.time()
+    if delay > 0:
+        time.sleep(delay)
+    return time.time()
+
+
+def _writer(worker_id: int, target: str, start_at: float, deadline: float, size: int) -> Dict[str, Any]:
+    began = _wait(start_at)
+    latencies = []
+    errors = 0
+    seq = 0
+    while time.time() < deadline:
+        content = _payload(worker_id, seq, size)
+        started = time.perf_counter()
+        try:
+            SecureFileOps.atomic_write(Path(target), content, 0o600)
+        except OSError:
+            errors += 1
+        latencies.append(time.perf_counter() - started)
+        seq += 1
+    return {"kind": "atomic_write", "ops": len(latencies), "errors": errors, "latencies": latencies,
+            "began": began, "ended": time.time()}
+
+
+def _reader(worker_id: int, target: str, start_at: float, deadline: float) -> Dict[str, Any]:
+    began = _wait(start_at)
+    latencies = []
+    torn = 0
+    errors = 0
+    while time.time() < deadline:
+        started = time.perf_counter()
+        try:
+            with open(target, "rb") as f:
+                content = f.read()
+            if not _valid_payload(content):
+                torn += 1
+        except OSError:
+            errors += 1
+        latencies.append(time.perf_counter() - started)
+    return {"kind": "read", "ops": len(latencies), "errors": errors, "torn": torn, "latencies": latencies,
+            "began": began, "ended": time.time()}
+
+
+def _locker(worker_id: int, counter: str, start_at: float, deadline: float) -> Dict[str, Any]:
+    """Incrementa o contador sob file_lock; um marcador O_EXCL detecta donos simultâneos."""
+    began = _wait(start_at)
+    counter_path = Path(counter)
+    holder = f"{counter}.holder"
+    latencies = []
+    double_holders = 0
+    increments = 0
+    while time.time() < deadline:
+        started = time.perf_counter()
+        with file_lock(counter_path):
+            try:
+                marker = os.open(holder, os.O_CREAT | os.O_EXCL | os.O_WRONLY, 0o600)
+                os.close(marker)
+                owns_marker = True
+            except FileExistsError:
+                double_holders += 1
+                owns_marker = False
+
+            # Leitura-modificação-escrita deliberadamente não atômica:
+            # só é correta se o lock realmente garantir exclusão mútua
+            value = int(counter_path.read_text() or 0)
+            counter_path.write_text(str(value + 1))
+            increments += 1
+
+            if owns_marker:
+                os.unlink(holder)
+        latencies.append(time.perf_counter() - started)
+    return {"kind": "file_lock", "ops": increments, "double_holders": double_holders, "latencies": latencies,
+            "began": began, "ended": time.time()}
+
+
+def run_stress(root: Optional[Path] = None, writers: int = DEFAULT_WRITERS, readers: int = DEFAULT_READERS,
+               lockers: int = DEFAULT_LOCKERS, duration: float = DEFAULT_DURATION,
+               payload_size: int = DEFAULT_PAYLOAD) -> Dict[str, Any]:
+    """Executa o stress e devolve um relatório comparável entre versões."""
+    temp_root = root is None
+    root = Path(tempfile.mkdtemp(prefix="j4stress.")) if temp_root else Path(root)
+    work_dir = root / STRESS_DIR
+    work_dir.mkdir(parents=True, exist_ok=True)
+    target = work_dir / "target.json"
+    counter = work_dir / "counter"
+    SecureFileOps.atomic_write(target, _payload(-1, 0, payload_size), 0o600)
+    counter.write_text("0")
+
+    try:
+        workers = writers + readers + lockers
+        start_at = time.time() + 0.5  # Todos os processos começam juntos
+        deadline = start_at + duration
+        with ProcessPoolExecutor(max_workers=max(1, workers)) as pool:
+            futures = (
+                [pool.submit(_writer, i, str(target), start_at, deadline, payload_size) for i in range(writers)]
+                + [pool.submit(_reader, i, str(target), start_at, deadline) for i in range(readers)]
+                + [pool.submit(_locker, i, str(counter), start_at, deadline) for i in range(lockers)]
+            )
+            results = [f.result() for f in futures]
+
+        results_by_kind = {}
+        violations = {"torn_reads": 0, "lost_updates": 0, "leftover_tmp": 0, "double_holders": 0}
+        for kind in ("atomic_write", "read", "file_lock"):
+            group = [r for r in results if r["kind"] == kind]
+            if not group:
+                continue
+            ops = sum(r["ops"] for r in group)
+            latencies = [lat for r in group for lat in r["latencies"]]
+            # Janela real: workers que largam atrasados ou cuja última operação
+            # passa do deadline não podem distorcer o ops/s
+            elapsed = max(r["ended"] for r in group) - min(r["began"] for r in group)
+            results_by_kind[kind] = {
+                "processes": len(group),
+                "ops": ops,
+                "elapsed": round(elapsed, 4),
+                "ops_per_sec": round(ops / elapsed, 1) if elapsed > 0 else 0.0,
+                "errors": sum(r.get("errors", 0) for r in group),
+                "latency_ms": _percentiles(latencies)
+            }
+            violations["torn_reads"] += sum(r.get("torn", 0) for r in group)
+            violations["double_holders"] += sum(r.get("double_holders", 0) for r in group)
+
+        if lockers:
+            expected = results_by_kind["file_lock"]["ops"]
+            violations["lost_updates"] = max(0, expected - int(counter.read_text() or 0))
+        violations["leftover_tmp"] = sum(1 for p in work_dir.iterdir() if p.name.endswith(".tmp"))
+        if not _valid_payload(target.read_bytes()):
+            violations["torn_reads"] += 1
+
+        return {
+            "timestamp": datetime.now().isoformat(),
+            "version": VERSION,
+            "config": {
+                "writers": writers,
+                "readers": readers,
+                "lockers": lockers,
+                "duration": duration,
+                "payload_size": payload_size,
+                "cpu_count": os.cpu_count()
+            },
+            "results": results_by_kind,
+            "violations": violations,
+            "passed": not any(violations.values())
+        }
+    finally:
+        if temp_root:
+            shutil.rmtree(root, ignore_errors=True)
+
+
+def main():
+    """Função principal"""
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description='j4stress - Stress de file_lock e atomic_write'
+    )
+    parser.add_argument('--writers', type=int, default=DEFAULT_WRITERS,
+                        help='Processos escrevendo com atomic_write')
+    parser.add_argument('--readers', type=int, default=DEFAULT_READERS,
+                        help='Processos lendo e verificando o arquivo escrito')
+    parser.add_argument('--lockers', type=int, default=DEFAULT_LOCKERS,
+                        help='Processos incrementando o contador sob file_lock')
+    parser.add_argument('--duration', type=float, default=DEFAULT_DURATION,
+                        help='Duração do teste em segundos')
+    parser.add_argument('--payload-size', type=int, default=DEFAULT_PAYLOAD,
+                        help='Tamanho aproximado de cada escrita em bytes')
+    parser.add_argument('--root', default=None,
+                        help='Raiz .J.4.R.V.1.5 a usar (padrão: raiz temporária descartada ao final)')
+    parser.add_argument('--history', metavar='FILE',
+                        help='Acrescentar o relatório como uma linha NDJSON em FILE')
+
+    args = parser.parse_args()
+
+    report = run_stress(
+        Path(args.root) if args.root else None,
+        writers=args.writers,
+        readers=args.readers,
+        lockers=args.lockers,
+        duration=args.duration,
+        payload_size=args.payload_size
+    )
+
+    if args.history:
+        Path(args.history).parent.mkdir(parents=True, exist_ok=True)
+        with open(args.history, "a") as f:
+            f.write(json.dumps(report) + "\n")
+
+    print(json.dumps(report, indent=2))
+    return 0 if report["passed"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
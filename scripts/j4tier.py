@@ -0,0 +1,380 @@
+#!/usr/bin/env python3
+"""
+j4tier - Tiering de dados frios de 20_workspace para 99_archive .J.4.R.V.1.5.
+Versão: 5.0.0
+
+Cada subárvore fria (sem acesso nem modificação há N dias) de
+20_workspace/{current,scratch} é empacotada em um único bundle zip
+comprimido em 99_archive/old/<área>/. O diretório central do zip serve de
+índice interno, então arquivos podem ser listados e lidos sem extrair o
+bundle. No lugar da subárvore fica um stub `<nome>.j4stub` (JSON) apontando
+para o bundle; `j4tier.py hydrate <stub>` restaura a árvore original.
+"""
+
+import os
+import sys
+import json
+import stat
+import shutil
+import hashlib
+import tempfile
+import time
+import zipfile
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+VERSION = "5.0.0"
+
+J4RV15_ROOT = Path.home() / ".J.4.R.V.1.5"
+TIER_AREAS = ["20_workspace/current", "20_workspace/scratch"]
+ARCHIVE_DIR = Path("99_archive") / "old"
+
+STUB_SUFFIX = ".j4stub"
+BUNDLE_SUFFIX = ".j4z"
+MANIFEST_NAME = ".j4tier/manifest.json"
+DEFAULT_MIN_AGE_DAYS = 90
+
+COMPRESSION = {
+    "deflate": zipfile.ZIP_DEFLATED,
+    "lzma": zipfile.ZIP_LZMA,
+    "bzip2": zipfile.ZIP_BZIP2,
+}
+
+
+class TierError(Exception):
+    """Erro em uma operação de tiering."""
+
+
+def _last_touched(path: Path, changes_only: bool = False) -> float:
+    """Maior atime/mtime da subárvore (sem seguir symlinks).
+
+    Diretórios e symlinks contam só pelo mtime: a própria varredura atualiza
+    o atime deles (relatime), o que tornaria toda árvore inspecionada "quente".
+    Com changes_only, usa mtime/ctime e ignora o atime, que o próprio
+    empacotamento atualiza ao ler os arquivos; a raiz conta só pelo mtime,
+    pois o rename que a tira do caminho atualiza seu ctime.
+    """
+    def newest_of(st: os.stat_result) -> float:
+        if changes_only:
+            return max(st.st_mtime, st.st_ctime)
+        if stat.S_ISREG(st.st_mode):
+            return max(st.st_atime, st.st_mtime)
+        return st.st_mtime
+
+    newest = path.lstat().st_mtime
+    for root, dirs, files in os.walk(path):
+        for name in dirs + files:
+            try:
+                newest = max(newest, newest_of(os.lstat(os.path.join(root, name))))
+            except OSError:
+                continue
+    return newest
+
+
+def find_cold(root: Path = J4RV15_ROOT, min_age_days: float = DEFAULT_MIN_AGE_DAYS) -> Iterator[Dict[str, Any]]:
+    """Subárvores de primeiro nível das áreas de tiering mais frias que min_age_days."""
+    cutoff = time.time() - min_age_days * 86400
+    for area in TIER_AREAS:
+        area_path = root / area
+        if not area_path.is_dir():
+            continue
+        for entry in sorted(area_path.iterdir()):
+            if entry.is_symlink() or not entry.is_dir():
+                continue
+            touched = _last_touched(entry)
+            if touched < cutoff:
+                yield {"path": str(entry), "area": area, "last_touched": touched}
+
+
+def _zip_info(arcname: str, st: os.stat_result) -> zipfile.ZipInfo:
+    info = zipfile.ZipInfo(arcname, date_time=time.localtime(max(st.st_mtime, 315532800))[:6])
+    info.external_attr = (st.st_mode & 0xFFFF) << 16
+    info.create_system = 3  # Unix: preserva modo e tipo do arquivo
+    return info
+
+
+def pack(subtree: str, root: str = str(J4RV15_ROOT), compression: str = "deflate") -> Dict[str, Any]:
+    """Empacota uma subárvore em um bundle, verifica-o e a substitui por um stub.
+
+    Executado em um processo worker; a escrita do bundle é atômica
+    (arquivo temporário + fsync + rename) e a subárvore só é removida
+    depois do bundle verificado e do stub gravado. Se algo na subárvore mudou
+    durante o empacotamento, a operação é desfeita e a subárvore mantida.
+    Um stub já existente com o mesmo nome nunca é sobrescrito: ele é a única
+    referência ao bundle anterior.
+    """
+    started = time.monotonic()
+    # Margem para a granularidade dos timestamps do sistema de arquivos
+    pack_started = time.time() - 1
+    # Caminhos absolutos: o stub precisa funcionar a partir de qualquer diretório
+    source = Path(subtree).absolute()
+    root_path = Path(root).absolute()
+    stub_path = source.with_name(source.name + STUB_SUFFIX)
+    if os.path.lexists(stub_path):
+        raise TierError(f"Stub já existe (hidrate-o ou renomeie a subárvore): {stub_path}")
+    area = str(source.parent.relative_to(root_path))
+    bundle_dir = root_path / ARCHIVE_DIR / Path(area).name
+    bundle_dir.mkdir(parents=True, exist_ok=True)
+    bundle = bundle_dir / f"{source.name}-{datetime.now().strftime('%Y%m%d_%H%M%S')}{BUNDLE_SUFFIX}"
+
+    manifest = {
+        "version": VERSION,
+        "source": str(source),
+        "created": datetime.now().isoformat(),
+        "entries": []
+    }
+    total_size = 0
+
+    fd, tmp_name = tempfile.mkstemp(dir=bundle_dir, prefix=f".{bundle.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as raw, zipfile.ZipFile(raw, "w", COMPRESSION[compression]) as zf:
+            for dir_path, dirs, files in os.walk(source):
+                # Symlinks para diretórios vêm em `dirs` (e não são seguidos): arquivá-los como symlinks
+                links = [d for d in dirs if os.path.islink(os.path.join(dir_path, d))]
+                dirs[:] = sorted(d for d in dirs if d not in links)
+                rel_dir = Path(dir_path).relative_to(source)
+                st = os.lstat(dir_path)
+                arc_dir = f"{rel_dir.as_posix()}/" if str(rel_dir) != "." else None
+                if arc_dir:
+                    zf.writestr(_zip_info(arc_dir, st), b"")
+                manifest["entries"].append({"path": rel_dir.as_posix(), "type": "dir",
+                                            "mode": stat.S_IMODE(st.st_mode), "mtime": st.st_mtime})
+
+                for file_name in sorted(files + links):
+                    file_path = Path(dir_path) / file_name
+                    arcname = (rel_dir / file_name).as_posix()
+                    st = file_path.lstat()
+                    entry = {"path": arcname, "mode": stat.S_IMODE(st.st_mode), "mtime": st.st_mtime}
+                    if stat.S_ISLNK(st.st_mode):
+                        entry["type"] = "symlink"
+                        zf.writestr(_zip_info(arcname, st), os.readlink(file_path))
+                    elif stat.S_ISREG(st.st_mode):
+                        entry["type"] = "file"
+                        entry["size"] = st.st_size
+                        info = _zip_info(arcname, st)
+                        info.compress_type = COMPRESSION[compression]
+                        digest = hashlib.sha256()
+                        with open(file_path, "rb") as src, zf.open(info, "w", force_zip64=st.st_size > zipfile.ZIP64_LIMIT) as dst:
+                            for chunk in iter(lambda: src.read(1024 * 1024), b""):
+                                digest.update(chunk)
+                                dst.write(chunk)
+                        entry["sha256"] = digest.hexdigest()
+                        total_size += st.st_size
+                    else:
+                        continue  # Sockets, FIFOs e devices não são arquivados
+                    manifest["entries"].append(entry)
+
+            manifest["total_size"] = total_size
+            zf.writestr(MANIFEST_NAME, json.dumps(manifest, indent=2))
+            raw.flush()
+            os.fsync(raw.fileno())
+
+        with zipfile.ZipFile(tmp_name) as zf:
+            bad = zf.testzip()
+            if bad is not None:
+                raise TierError(f"Bundle corrompido ({bad}): {tmp_name}")
+        os.chmod(tmp_name, 0o600)
+        os.rename(tmp_name, bundle)
+    except BaseException:
+        try:
+            os.unlink(tmp_name)
+        except OSError:
+            pass
+        raise
+
+    stub = {
+        "version": VERSION,
+        "source": str(source),
+        "bundle": str(bundle),
+        "created": manifest["created"],
+        "files": sum(1 for e in manifest["entries"] if e["type"] != "dir"),
+        "total_size": total_size,
+        "bundle_size": bundle.stat().st_size
+    }
+    stub_tmp = stub_path.with_name(f".{stub_path.name}.{os.getpid()}.tmp")
+    stub_tmp.write_text(json.dumps(stub, indent=2) + "\n")
+    try:
+        # link() falha se o stub surgiu durante o empacotamento; rename() o sobrescreveria
+        os.link(stub_tmp, stub_path)
+    except FileExistsError:
+        bundle.unlink()
+        raise TierError(f"Stub já existe (hidrate-o ou renomeie a subárvore): {stub_path}")
+    finally:
+        stub_tmp.unlink()
+
+    # Tira a subárvore do caminho antes de verificar: escritas posteriores pelo
+    # caminho original não podem mais cair na árvore que será removida
+    trash = source.with_name(f".{source.name}.j4tier-remove")
+    try:
+        os.rename(source, trash)
+    except OSError:
+        stub_path.unlink()
+        bundle.unlink()
+        raise
+    if _last_touched(trash, changes_only=True) >= pack_started:
+        os.rename(trash, source)
+        stub_path.unlink()
+        bundle.unlink()
+        raise TierError(f"Subárvore modificada durante o empacotamento, mantida: {source}")
+    shutil.rmtree(trash)
+
+    stub["stub"] = str(stub_path)
+    stub["elapsed"] = round(time.monotonic() - started, 4)
+    return stub
+
+
+def _resolve_bundle(target: str) -> Path:
+    """Aceita um bundle ou um stub e devolve o caminho do bundle."""
+    path = Path(target)
+    if path.name.endswith(STUB_SUFFIX):
+        return Path(json.loads(path.read_text())["bundle"])
+    return path
+
+
+def list_bundle(target: str) -> List[Dict[str, Any]]:
+    """Lista o conteúdo do bundle lendo apenas o índice (diretório central)."""
+    with zipfile.ZipFile(_resolve_bundle(target)) as zf:
+        return [
+            {"path": info.filename, "size": info.file_size, "compressed": info.compress_size}
+            for info in zf.infolist()
+            if info.filename != MANIFEST_NAME and not info.is_dir()
+        ]
+
+
+def read_member(target: str, member: str) -> bytes:
+    """Lê um único arquivo do bundle sem extrair os demais."""
+    with zipfile.ZipFile(_resolve_bundle(target)) as zf:
+        try:
+            return zf.read(member)
+        except KeyError:
+            raise TierError(f"Arquivo não encontrado no bundle: {member}")
+
+
+def hydrate(stub_file: str, keep_bundle: bool = False) -> Dict[str, Any]:
+    """Restaura a subárvore de um stub, com modos e mtimes originais."""
+    stub_path = Path(stub_file)
+    stub = json.loads(stub_path.read_text())
+    bundle = Path(stub["bundle"])
+    source = Path(stub["source"])
+    if not source.is_absolute():
+        # Stubs de versões anteriores podiam guardar o caminho relativo: a subárvore fica ao lado do stub
+        source = stub_path.absolute().parent / source.name
+    if source.exists():
+        raise TierError(f"Destino já existe: {source}")
+
+    # Resolvido: a checagem de traversal compara com dest.resolve()
+    staging = Path(tempfile.mkdtemp(dir=source.parent, prefix=f".{source.name}.", suffix=".hydrate")).resolve()
+    try:
+        with zipfile.ZipFile(bundle) as zf:
+            manifest = json.loads(zf.read(MANIFEST_NAME))
+            for entry in manifest["entries"]:
+                dest = staging / entry["path"]
+                if os.path.commonpath([staging, dest.resolve()]) != str(staging):
+                    raise TierError(f"Path traversal detectado no bundle: {entry['path']}")
+                if entry["type"] == "dir":
+                    dest.mkdir(parents=True, exist_ok=True)
+                elif entry["type"] == "symlink":
+                    os.symlink(zf.read(entry["path"]).decode(), dest)
+                else:
+                    with zf.open(entry["path"]) as src, open(dest, "wb") as dst:
+                        shutil.copyfileobj(src, dst, 1024 * 1024)
+
+            # Modos e mtimes por último, dos arquivos para os diretórios mais profundos
+            for entry in reversed(manifest["entries"]):
+                dest = staging / entry["path"]
+                if entry["type"] == "symlink":
+                    continue
+                os.chmod(dest, entry["mode"])
+                os.utime(dest, (entry["mtime"], entry["mtime"]))
+
+        os.rename(staging, source)
+    except BaseException:
+        shutil.rmtree(staging, ignore_errors=True)
+        raise
+
+    stub_path.unlink()
+    if not keep_bundle:
+        bundle.unlink()
+    return {"restored": str(source), "bundle": str(bundle), "bundle_kept": keep_bundle}
+
+
+def tier(root: Path = J4RV15_ROOT, min_age_days: float = DEFAULT_MIN_AGE_DAYS,
+         workers: Optional[int] = None, compression: str = "deflate") -> Iterator[Dict[str, Any]]:
+    """Empacota todas as subárvores frias em paralelo, emitindo cada resultado."""
+    cold = [c["path"] for c in find_cold(root, min_age_days)]
+    if not cold:
+        return
+    with ProcessPoolExecutor(max_workers=workers or min(len(cold), os.cpu_count() or 1)) as pool:
+        futures = {pool.submit(pack, path, str(root), compression): path for path in cold}
+        for future in as_completed(futures):
+            try:
+                yield {"status": "OK", **future.result()}
+            except Exception as e:
+                yield {"status": "ERROR", "source": futures[future], "message": str(e)}
+
+
+def main():
+    """Função principal"""
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description='j4tier - Tiering de dados frios para 99_archive'
+    )
+    parser.add_argument('--root', default=str(J4RV15_ROOT),
+                        help='Raiz .J.4.R.V.1.5')
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    scan_parser = sub.add_parser('scan', help='Listar subárvores frias')
+    pack_parser = sub.add_parser('pack', help='Empacotar subárvores frias')
+    for p in (scan_parser, pack_parser):
+        p.add_argument('--days', type=float, default=DEFAULT_MIN_AGE_DAYS,
+                       help='Idade mínima (acesso e modificação) em dias')
+    pack_parser.add_argument('--workers', type=int, default=None,
+                             help='Número de processos em paralelo')
+    pack_parser.add_argument('--compression', choices=sorted(COMPRESSION), default='deflate',
+                             help='Algoritmo de compressão do bundle')
+
+    ls_parser = sub.add_parser('ls', help='Listar arquivos de um bundle ou stub')
+    ls_parser.add_argument('target')
+
+    cat_parser = sub.add_parser('cat', help='Ler um arquivo de um bundle ou stub')
+    cat_parser.add_argument('target')
+    cat_parser.add_argument('member')
+
+    hydrate_parser = sub.add_parser('hydrate', help='Restaurar a subárvore de um stub')
+    hydrate_parser.add_argument('stub')
+    hydrate_parser.add_argument('--keep-bundle', action='store_true',
+                                help='Manter o bundle após restaurar')
+
+    args = parser.parse_args()
+    root = Path(args.root).absolute()
+
+    try:
+        if args.command == 'scan':
+            for cold in find_cold(root, args.days):
+                touched = datetime.fromtimestamp(cold["last_touched"]).strftime("%Y-%m-%d")
+                print(f"{touched}  {cold['path']}")
+        elif args.command == 'pack':
+            failed = 0
+            for result in tier(root, args.days, args.workers, args.compression):
+                print(json.dumps(result))
+                failed += result["status"] != "OK"
+            return 1 if failed else 0
+        elif args.command == 'ls':
+            for entry in list_bundle(args.target):
+                print(f"{entry['size']:>12}  {entry['path']}")
+        elif args.command == 'cat':
+            sys.stdout.buffer.write(read_member(args.target, args.member))
+        elif args.command == 'hydrate':
+            result = hydrate(args.stub, args.keep_bundle)
+            print(f"✅ Restaurado: {result['restored']}")
+    except (TierError, OSError, zipfile.BadZipFile) as e:
+        print(f"❌ {e}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,426 @@
+#!/usr/bin/env python3
+"""
+PassResolver - Resolução em lote de segredos do pass .J.4.R.V.1.5.
+Versão: 5.0.0
+
+Responsabilidades:
+- Decriptar muitas entradas do cofre em uma única sessão gpg
+- Manter os valores em cache com TTL, em memória travada (mlock)
+  e zerada ao expirar
+- Renderizar os segredos como arquivo .env ou entregá-los a um processo filho
+"""
+
+import os
+import re
+import sys
+import mmap
+import time
+import ctypes
+import ctypes.util
+import atexit
+import tempfile
+import warnings
+import threading
+import subprocess
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+DEFAULT_STORE = Path.home() / ".J.4.R.V.1.5" / "60_secrets" / ".password-store"
+DEFAULT_TTL = 300
+
+# tmpfs de fallback quando $XDG_RUNTIME_DIR não existe
+SHM_DIR = "/dev/shm"
+
+_libc = ctypes.CDLL(ctypes.util.find_library("c") or None, use_errno=True)
+_libc.mlock.argtypes = _libc.munlock.argtypes = [ctypes.c_void_p, ctypes.c_size_t]
+
+
+class PassResolverError(Exception):
+    """Erro ao resolver segredos do pass."""
+
+
+@contextmanager
+def _private_umask():
+    old = os.umask(0o077)
+    try:
+        yield
+    finally:
+        os.umask(old)
+
+
+def wipe(value: bytearray) -> None:
+    """Zera um bytearray no lugar (cópias de trabalho devolvidas pelo resolver)."""
+    value[:] = bytes(len(value))
+
+
+class _LockedBuffer:
+    """Buffer fora do heap do Python, travado em RAM (mlock) e zerado ao liberar.
+
+    Cada buffer é um mmap anônimo próprio, alinhado e arredondado à página:
+    como mlock/munlock operam em páginas inteiras, buffers que dividissem uma
+    página destravariam os vizinhos ao serem liberados. O texto claro é lido
+    direto do descritor para o buffer (readv), sem passar por objetos `bytes`
+    imutáveis. Se RLIMIT_MEMLOCK não permitir o mlock, o buffer continua
+    funcionando (apenas sem a garantia de não ir para o swap), `locked` fica
+    False e um RuntimeWarning é emitido.
+    """
+
+    def __init__(self, size: int):
+        self.size = size
+        length = -(-max(1, size) // mmap.PAGESIZE) * mmap.PAGESIZE
+        self._map = mmap.mmap(-1, length, flags=mmap.MAP_PRIVATE | mmap.MAP_ANONYMOUS)
+        anchor = ctypes.c_char.from_buffer(self._map)
+        self._address = ctypes.addressof(anchor)
+        del anchor  # libera o export; senão o mmap não pode ser fechado
+        self.locked = _libc.mlock(self._address, length) == 0
+        if not self.locked:
+            warnings.warn(
+                f"mlock falhou ({os.strerror(ctypes.get_errno())}): segredos em cache "
+                "podem ir para o swap; aumente RLIMIT_MEMLOCK (ulimit -l)",
+                RuntimeWarning, stacklevel=2
+            )
+
+    @classmethod
+    def from_fd(cls, fd: int, size: int) -> "_LockedBuffer":
+        """Lê até `size` bytes de fd diretamente para um buffer travado."""
+        buf = cls(size)
+        view = memoryview(buf._map)
+        filled = 0
+        while filled < size:
+            count = os.readv(fd, [view[filled:size]])
+            if not count:
+                break
+            filled += count
+        view.release()
+        buf.size = filled
+        return buf
+
+    def copy(self) -> bytearray:
+        """Cópia de trabalho que o chamador deve zerar com `wipe()` após o uso."""
+        with memoryview(self._map) as view:
+            return bytearray(view[:self.size])
+
+    def wipe(self) -> None:
+        """Zera, destrava e desmapeia somente as páginas deste buffer."""
+        if self._map is None:
+            return
+        length = len(self._map)
+        ctypes.memset(self._address, 0, length)
+        if self.locked:
+            _libc.munlock(self._address, length)
+        self._map.close()
+        self._map = None
+
+
+class SecretCache:
+    """Cache thread-safe com TTL; entradas expiradas são zeradas na remoção."""
+
+    def __init__(self, ttl: float = DEFAULT_TTL):
+        self.ttl = ttl
+        self._entries: Dict[str, Tuple[float, _LockedBuffer]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, name: str) -> Optional[bytearray]:
+        """Cópia (bytearray) do valor em cache; o chamador deve zerá-la com `wipe()`."""
+        with self._lock:
+            entry = self._entries.get(name)
+            if entry is None:
+                return None
+            expires, buf = entry
+            if expires <= time.monotonic():
+                del self._entries[name]
+                buf.wipe()
+                return None
+            return buf.copy()
+
+    def put(self, name: str, buf: _LockedBuffer) -> None:
+        """Armazena o buffer travado (o cache passa a ser dono dele)."""
+        with self._lock:
+            old = self._entries.pop(name, None)
+            self._entries[name] = (time.monotonic() + self.ttl, buf)
+        if old:
+            old[1].wipe()
+
+    def purge(self) -> int:
+        """Remove e zera as entradas expiradas. Retorna quantas foram removidas."""
+        now = time.monotonic()
+        with self._lock:
+            expired = [name for name, (expires, _) in self._entries.items() if expires <= now]
+            buffers = [self._entries.pop(name)[1] for name in expired]
+        for buf in buffers:
+            buf.wipe()
+        return len(buffers)
+
+    def clear(self) -> None:
+        with self._lock:
+            buffers = [buf for _, buf in self._entries.values()]
+            self._entries.clear()
+        for buf in buffers:
+            buf.wipe()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class PassResolver:
+    """Resolve entradas do pass em lote, com cache em memória travada."""
+
+    def __init__(self, store_dir: Optional[str] = None, ttl: float = DEFAULT_TTL,
+                 gnupg_home: Optional[str] = None, gpg: str = "gpg"):
+        if store_dir is None:
+            store_dir = os.environ.get("PASSWORD_STORE_DIR", str(DEFAULT_STORE))
+        self.store_dir = Path(store_dir).expanduser()
+        self.cache = SecretCache(ttl)
+        self.gpg = gpg
+        self.env = os.environ.copy()
+        if gnupg_home is not None:
+            self.env["GNUPGHOME"] = str(gnupg_home)
+        atexit.register(self.cache.clear)
+
+    def _entry_path(self, name: str) -> Path:
+        """Caminho do .gpg da entrada, impedindo path traversal para fora do cofre."""
+        store = os.path.realpath(self.store_dir)
+        path = os.path.realpath(self.store_dir / f"{name}.gpg")
+        if os.path.commonpath([store, path]) != store:
+            raise PassResolverError(f"Path traversal detectado: {name}")
+        if not os.path.isfile(path):
+            raise PassResolverError(f"Segredo não encontrado: {name}")
+        return Path(path)
+
+    def _runtime_dir(self) -> str:
+        """Diretório em tmpfs para os textos claros transitórios do gpg.
+
+        Nunca cai para $TMPDIR ou /tmp: lá o gpg gravaria segredos em disco.
+        """
+        for candidate in (os.environ.get("XDG_RUNTIME_DIR"), SHM_DIR):
+            if candidate and os.path.isdir(candidate) and os.access(candidate, os.W_OK):
+                return candidate
+        raise PassResolverError(
+            "Nenhum tmpfs gravável ($XDG_RUNTIME_DIR ou /dev/shm): "
+            "recusando decriptar para um diretório em disco"
+        )
+
+    def _decrypt_batch(self, names: List[str]) -> Dict[str, _LockedBuffer]:
+        """Decripta todas as entradas com um único processo gpg (--decrypt-files).
+
+        Cada entrada é exposta como um symlink `N.gpg` em um diretório 0700 no
+        tmpfs; o gpg grava o texto claro em `N`, que é lido direto para um
+        buffer travado, sobrescrito com zeros e removido imediatamente.
+        """
+        paths = [self._entry_path(name) for name in names]
+        runtime_dir = self._runtime_dir()
+        results = {}
+
+        with _private_umask(), tempfile.TemporaryDirectory(prefix="j4pass.", dir=runtime_dir) as work:
+            links = []
+            for index, path in enumerate(paths):
+                link = os.path.join(work, f"{index}.gpg")
+                os.symlink(path, link)
+                links.append(link)
+
+            try:
+                process = subprocess.run(
+                    [self.gpg, "--batch", "--quiet", "--yes", "--decrypt-files"] + links,
+                    capture_output=True,
+                    env=self.env
+                )
+            except OSError as e:
+                raise PassResolverError(f"Não foi possível executar {self.gpg}: {e}") from e
+
+            errors = []
+            for index, name in enumerate(names):
+                plain = os.path.join(work, str(index))
+                try:
+                    fd = os.open(plain, os.O_RDWR | os.O_NOFOLLOW)
+                except FileNotFoundError:
+                    errors.append(name)
+                    continue
+                try:
+                    size = os.fstat(fd).st_size
+                    results[name] = _LockedBuffer.from_fd(fd, size)
+                    os.lseek(fd, 0, os.SEEK_SET)
+                    os.write(fd, bytes(size))
+                    os.fsync(fd)
+                finally:
+                    os.close(fd)
+                    os.unlink(plain)
+
+        if errors:
+            for buf in results.values():
+                buf.wipe()
+            message = process.stderr.decode(errors="replace").strip()
+            raise PassResolverError(f"Falha ao decriptar {', '.join(errors)}: {message}")
+        return results
+
+    def resolve(self, names: Iterable[str]) -> Dict[str, bytearray]:
+        """Retorna uma cópia de trabalho (bytearray) de cada entrada.
+
+        Faltas no cache são decriptadas em lote. As cópias ficam fora da memória
+        travada: zere-as com `wipe()` após o uso, ou prefira `secrets()`.
+        """
+        names = list(dict.fromkeys(names))
+        self.cache.purge()
+
+        resolved = {}
+        missing = []
+        for name in names:
+            value = self.cache.get(name)
+            if value is None:
+                missing.append(name)
+            else:
+                resolved[name] = value
+
+        if missing:
+            for name, buf in self._decrypt_batch(missing).items():
+                resolved[name] = buf.copy()
+                self.cache.put(name, buf)
+
+        return {name: resolved[name] for name in names}
+
+    @contextmanager
+    def secrets(self, names: Iterable[str]) -> Iterator[Dict[str, bytearray]]:
+        """Como `resolve()`, mas zera as cópias de trabalho ao sair do bloco."""
+        values = self.resolve(names)
+        try:
+            yield values
+        finally:
+            for value in values.values():
+                wipe(value)
+
+    def render_env(self, mapping: Dict[str, str], full: bool = False) -> bytearray:
+        """Renderiza VAR=valor por linha. Por convenção do pass, usa só a primeira
+        linha de cada entrada, a menos que full=True.
+
+        O resultado é um bytearray pré-dimensionado (sem realocações que deixem
+        restos no heap); o chamador deve zerá-lo com `wipe()`.
+        """
+        with self.secrets(mapping.values()) as values:
+            lines = []
+            for var, name in mapping.items():
+                raw = values[name]
+                end = len(raw)
+                if not full and raw.find(b"\n") >= 0:
+                    end = raw.find(b"\n")
+                if raw.find(b"\n", 0, end) >= 0:
+                    raise PassResolverError(f"Valor multilinha não cabe em .env: {name}")
+                lines.append((var.encode() + b"=", memoryview(raw)[:end]))
+
+            content = bytearray(sum(len(prefix) + len(value) + 1 for prefix, value in lines))
+            position = 0
+            for prefix, value in lines:
+                for part in (prefix, value, b"\n"):
+                    content[position:position + len(part)] = part
+                    position += len(part)
+                value.release()
+            return content
+
+    def close(self) -> None:
+        self.cache.clear()
+
+
+def env_name(name: str) -> str:
+    """Deriva o nome da variável de ambiente: J4RV15/api/openai -> OPENAI."""
+    return re.sub(r"[^A-Za-z0-9_]", "_", name.rstrip("/").rsplit("/", 1)[-1]).upper()
+
+
+def parse_mapping(specs: Iterable[str]) -> Dict[str, str]:
+    """Converte `VAR=entrada` ou `entrada` em {VAR: entrada}."""
+    mapping = {}
+    for spec in specs:
+        spec = spec.strip()
+        if not spec or spec.startswith("#"):
+            continue
+        if "=" in spec:
+            var, name = spec.split("=", 1)
+            mapping[var.strip()] = name.strip()
+        else:
+            mapping[env_name(spec)] = spec
+    return mapping
+
+
+def main():
+    """Função principal"""
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description='PassResolver - Resolução em lote de segredos do pass'
+    )
+    parser.add_argument('--store', default=None,
+                        help='Diretório do cofre (padrão: $PASSWORD_STORE_DIR ou 60_secrets/.password-store)')
+    parser.add_argument('--map', metavar='FILE', action='append', default=[],
+                        help='Arquivo com uma linha VAR=entrada por segredo')
+    parser.add_argument('--full', action='store_true',
+                        help='Usar a entrada inteira em vez de só a primeira linha')
+
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    env_parser = sub.add_parser('env', help='Renderizar um arquivo .env')
+    env_parser.add_argument('entries', nargs='*', help='VAR=entrada ou entrada')
+    env_parser.add_argument('--output', metavar='FILE',
+                            help='Gravar o .env em FILE (0600) em vez de stdout')
+
+    run_parser = sub.add_parser('run', help='Executar um comando com os segredos (após --)')
+    run_parser.add_argument('entries', nargs='*', help='VAR=entrada ou entrada')
+    run_parser.add_argument('--stdin', action='store_true',
+                            help='Entregar o .env pelo stdin do filho em vez do ambiente')
+
+    # Tudo após `--` é o comando do filho, sem passar pelo argparse
+    argv = sys.argv[1:]
+    cmd = []
+    if '--' in argv:
+        split = argv.index('--')
+        argv, cmd = argv[:split], argv[split + 1:]
+    args = parser.parse_args(argv)
+
+    specs = list(args.entries)
+    for map_file in args.map:
+        specs.extend(Path(map_file).read_text().splitlines())
+    mapping = parse_mapping(specs)
+
+    resolver = PassResolver(args.store)
+    try:
+        if args.command == 'env':
+            content = resolver.render_env(mapping, full=args.full)
+            try:
+                if args.output:
+                    with _private_umask():
+                        fd = os.open(args.output, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | os.O_NOFOLLOW, 0o600)
+                    with os.fdopen(fd, 'wb') as f:
+                        f.write(content)
+                else:
+                    sys.stdout.buffer.write(content)
+            finally:
+                wipe(content)
+            return 0
+
+        if not cmd:
+            parser.error('run requer um comando após --')
+
+        if args.stdin:
+            content = resolver.render_env(mapping, full=args.full)
+            try:
+                return subprocess.run(cmd, input=content).returncode
+            finally:
+                wipe(content)
+
+        # O execve exige valores imutáveis: estas cópias não podem ser zeradas
+        # (e o filho as herda no ambiente). Prefira --stdin para segredos sensíveis.
+        child_env = os.environb.copy()
+        with resolver.secrets(mapping.values()) as values:
+            for var, name in mapping.items():
+                value = values[name]
+                end = len(value) if args.full or value.find(b"\n") < 0 else value.find(b"\n")
+                with memoryview(value) as view:
+                    child_env[var.encode()] = bytes(view[:end])
+        return subprocess.run(cmd, env=child_env).returncode
+
+    except PassResolverError as e:
+        print(f"❌ {e}", file=sys.stderr)
+        return 1
+    finally:
+        resolver.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -10,14 +10,30 @@ Responsabilidades:
 - Detectar inconsistências
 - Orquestrar migração para pass
 - Gerar relatórios de auditoria
+- Auditar frotas de raízes .J.4.R.V.1.5 em paralelo (modo fleet)
 """
 
 import os
+import pwd
+import sys
 import stat
+import time
+import signal
 import subprocess
 import json
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures import TimeoutError as FuturesTimeout
 from pathlib import Path
-from typing import Dict, List
+from typing import Dict, Iterable, Iterator, List
+
+J4RV15_DIRNAME = ".J.4.R.V.1.5"
+
+# Bases padrão do modo fleet: contas humanas e homes de usuários de serviço
+DEFAULT_FLEET_BASES = ["/home", "/root", "/var/lib", "/srv"]
+
+# Folga (s) do prazo total do modo fleet sobre o tempo limite por raiz
+FLEET_DEADLINE_GRACE = 5
 
 class SecretManagerAgent:
     def __init__(self, secrets_base_path: str = None):
@@ -69,18 +85,92 @@ class SecretManagerAgent:
             "missing_components": []
         }
         
+        for finding in self._iter_audit():
+            if finding["type"] == "component":
+                audit_results["structure"][finding["component"]] = {
+                    "exists": True,
+                    "type": finding["kind"],
+                    "description": finding["description"]
+                }
+            else:
+                audit_results["missing_components"].append(finding["component"])
+        
+        return audit_results
+
+    def iter_task(self, task: Dict) -> Iterator[Dict]:
+        """Versão em streaming de run_task: emite cada achado assim que é encontrado.
+
+        A memória fica constante mesmo em árvores enormes; cada achado é um
+        dicionário com a chave "type" (component, missing_component,
+        normalized, incorrect_permissions, migration_status ou error).
+        """
+        action = task.get("action")
+
+        if action == "prepare_migration":
+            yield dict(self._prepare_migration(), type="migration_status")
+            return
+        if action not in ("audit", "normalize_permissions", "detect_inconsistencies"):
+            yield {"type": "error", "message": f"Ação desconhecida: {action}"}
+            return
+        if not self.secrets_path.exists():
+            yield {"type": "error", "message": f"Diretório de segredos não encontrado: {self.secrets_path}"}
+            return
+
+        if action == "audit":
+            yield from self._iter_audit()
+        elif action == "normalize_permissions":
+            yield from self._iter_normalize_permissions()
+        else:
+            yield from self._iter_inconsistencies()
+
+    def _iter_audit(self) -> Iterator[Dict]:
         for component, description in self.expected_structure.items():
             component_path = self.secrets_path / component
             if component_path.exists():
-                audit_results["structure"][component] = {
-                    "exists": True,
-                    "type": "symlink" if component_path.is_symlink() else ("directory" if component_path.is_dir() else "file"),
+                yield {
+                    "type": "component",
+                    "component": component,
+                    "kind": "symlink" if component_path.is_symlink() else ("directory" if component_path.is_dir() else "file"),
                     "description": description
                 }
             else:
-                audit_results["missing_components"].append(component)
-        
-        return audit_results
+                yield {"type": "missing_component", "component": component}
+
+    def _iter_normalize_permissions(self) -> Iterator[Dict]:
+        for root, dirs, files in os.walk(self.secrets_path):
+            # Normaliza permissões de diretórios para 700 e de arquivos para 600
+            for names, kind, expected in ((dirs, "directory", 0o700), (files, "file", 0o600)):
+                for name in names:
+                    item_path = Path(root) / name
+                    if item_path.is_symlink():
+                        continue
+                    try:
+                        current_perms = stat.S_IMODE(item_path.stat().st_mode)
+                        if current_perms != expected:
+                            item_path.chmod(expected)
+                            yield {
+                                "type": "normalized",
+                                "kind": kind,
+                                "path": str(item_path),
+                                "old_mode": oct(current_perms),
+                                "new_mode": oct(expected)
+                            }
+                    except OSError as e:
+                        yield {"type": "error", "path": str(item_path), "message": str(e)}
+
+    def _iter_inconsistencies(self) -> Iterator[Dict]:
+        for root, dirs, files in os.walk(self.secrets_path):
+            for file_name in files:
+                file_path = Path(root) / file_name
+                if file_path.is_symlink():
+                    continue
+                try:
+                    current_perms = stat.S_IMODE(file_path.stat().st_mode)
+                except OSError as e:
+                    yield {"type": "error", "path": str(file_path), "message": str(e)}
+                    continue
+                if current_perms != 0o600:
+                    yield {"type": "incorrect_permissions", "path": str(file_path), "mode": oct(current_perms)}
 
     def _normalize_permissions(self):
         """Normaliza as permissões de arquivos e diretórios."""
@@ -91,30 +181,21 @@ class SecretManagerAgent:
             }
         
         normalized_items = []
+        errors = []
+        for finding in self._iter_normalize_permissions():
+            if finding["type"] == "normalized":
+                normalized_items.append(finding["path"])
+            elif finding["type"] == "error":
+                errors.append({"path": finding["path"], "message": finding["message"]})
         
-        for root, dirs, files in os.walk(self.secrets_path):
-            # Normaliza permissões de diretórios para 700
-            for dir_name in dirs:
-                dir_path = Path(root) / dir_name
-                if not dir_path.is_symlink():
-                    current_perms = stat.S_IMODE(dir_path.stat().st_mode)
-                    if current_perms != 0o700:
-                        dir_path.chmod(0o700)
-                        normalized_items.append(str(dir_path))
-            
-            # Normaliza permissões de arquivos para 600
-            for file_name in files:
-                file_path = Path(root) / file_name
-                if not file_path.is_symlink():
-                    current_perms = stat.S_IMODE(file_path.stat().st_mode)
-                    if current_perms != 0o600:
-                        file_path.chmod(0o600)
-                        normalized_items.append(str(file_path))
-        
+        message = f"Permissões normalizadas para {len(normalized_items)} itens"
+        if errors:
+            message += f", {len(errors)} falharam"
         return {
-            "status": "OK",
-            "message": f"Permissões normalizadas para {len(normalized_items)} itens",
-            "normalized_items": normalized_items
+            "status": "ERROR" if errors else "OK",
+            "message": message,
+            "normalized_items": normalized_items,
+            "errors": errors
         }
 
     def _detect_inconsistencies(self):
@@ -131,17 +212,18 @@ class SecretManagerAgent:
             "unexpected_items": []
         }
         
-        for root, dirs, files in os.walk(self.secrets_path):
-            for file_name in files:
-                file_path = Path(root) / file_name
-                if not file_path.is_symlink():
-                    current_perms = stat.S_IMODE(file_path.stat().st_mode)
-                    if current_perms != 0o600:
-                        inconsistencies["incorrect_permissions"].append(str(file_path))
+        errors = []
+        
+        for finding in self._iter_inconsistencies():
+            if finding["type"] == "incorrect_permissions":
+                inconsistencies["incorrect_permissions"].append(finding["path"])
+            elif finding["type"] == "error":
+                errors.append({"path": finding["path"], "message": finding["message"]})
         
         return {
-            "status": "OK",
-            "inconsistencies": inconsistencies
+            "status": "ERROR" if errors else "OK",
+            "inconsistencies": inconsistencies,
+            "errors": errors
         }
 
     def _prepare_migration(self):
@@ -174,10 +256,257 @@ class SecretManagerAgent:
             "ready_for_migration": pass_installed and pass_initialized
         }
 
+class _RootTimeout(Exception):
+    """Sinaliza que a auditoria de uma raiz excedeu o tempo limite."""
+
+
+def _raise_root_timeout(signum, frame):
+    raise _RootTimeout()
+
+
+def discover_j4rv15_roots(base_paths: Iterable[str], include_passwd: bool = False) -> List[str]:
+    """Descobre raízes .J.4.R.V.1.5 diretamente em cada base ou um nível abaixo dela.
+
+    Com include_passwd, também considera o home de cada conta em /etc/passwd
+    (cobre usuários de serviço com homes fora das bases).
+    """
+    candidates = []
+    for base in base_paths:
+        base_path = Path(base)
+        candidates.append(base_path / J4RV15_DIRNAME)
+        try:
+            with os.scandir(base_path) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        candidates.append(Path(entry.path) / J4RV15_DIRNAME)
+        except OSError:
+            continue
+
+    if include_passwd:
+        for account in pwd.getpwall():
+            if account.pw_dir:
+                candidates.append(Path(account.pw_dir) / J4RV15_DIRNAME)
+
+    roots = []
+    seen = set()
+    for candidate in candidates:
+        try:
+            if not candidate.is_dir():
+                continue
+            real = os.path.realpath(candidate)
+        except OSError:
+            continue
+        if real not in seen:
+            seen.add(real)
+            roots.append(str(candidate))
+    return sorted(roots)
+
+
+def audit_root(root: str, timeout: int = 60) -> Dict:
+    """Audita uma única raiz .J.4.R.V.1.5 (executado dentro do processo worker).
+
+    O tempo limite é aplicado com SIGALRM no próprio worker, de modo que uma
+    raiz lenta (NFS, árvore gigante) não bloqueia o pool.
+    """
+    started = time.monotonic()
+    result = {"type": "root", "root": root}
+
+    previous = signal.signal(signal.SIGALRM, _raise_root_timeout)
+    signal.alarm(max(1, int(timeout)))
+    try:
+        agent = SecretManagerAgent(str(Path(root) / "60_secrets"))
+        audit = agent.run_task({"action": "audit"})
+        result["audit"] = audit
+        result["status"] = audit["status"]
+        if audit["status"] == "OK":
+            detection = agent.run_task({"action": "detect_inconsistencies"})
+            result["inconsistencies"] = detection["inconsistencies"]
+            if detection["errors"]:
+                result["status"] = "ERROR"
+                result["errors"] = detection["errors"]
+    except _RootTimeout:
+        result["status"] = "TIMEOUT"
+        result["message"] = f"Tempo limite de {timeout}s excedido"
+    except OSError as e:
+        result["status"] = "ERROR"
+        result["message"] = str(e)
+    finally:
+        signal.alarm(0)
+        signal.signal(signal.SIGALRM, previous)
+
+    result["elapsed"] = round(time.monotonic() - started, 4)
+    return result
+
+
+def _register_worker(pids) -> None:
+    """Initializer do pool: informa o pid do worker ao processo pai."""
+    pids.put(os.getpid())
+
+
+def fleet_audit(roots: Iterable[str], workers: int = None, timeout: int = 60) -> Iterator[Dict]:
+    """Audita várias raízes em um pool de processos, emitindo cada resultado ao concluir.
+
+    O SIGALRM do worker não interrompe uma syscall ininterruptível (home em
+    NFS travado), então o processo pai também impõe um prazo total: as raízes
+    que não concluírem até lá são reportadas como TIMEOUT e seus workers
+    são encerrados.
+    """
+    roots = list(roots)
+    if not roots:
+        return
+    if workers is None:
+        workers = min(len(roots), (os.cpu_count() or 1) * 4)
+    workers = max(1, workers)
+
+    # Pior caso sem travamentos: cada worker audita sua fila inteira até o limite
+    deadline = max(1, int(timeout)) * -(-len(roots) // workers) + FLEET_DEADLINE_GRACE
+
+    # Pids dos workers, para encerrar os que ficarem presos após o prazo
+    worker_pids = multiprocessing.SimpleQueue()
+    pool = ProcessPoolExecutor(max_workers=workers, initializer=_register_worker,
+                               initargs=(worker_pids,))
+    futures = {pool.submit(audit_root, root, timeout): root for root in roots}
+    pending = set(futures)
+    try:
+        for future in as_completed(futures, timeout=deadline):
+            pending.discard(future)
+            try:
+                yield future.result()
+            except Exception as e:
+                yield {"type": "root", "root": futures[future], "status": "ERROR", "message": str(e)}
+    except FuturesTimeout:
+        for future in sorted(pending, key=futures.get):
+            yield {"type": "root", "root": futures[future], "status": "TIMEOUT",
+                   "message": f"Prazo total de {deadline}s da frota excedido"}
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
+        if pending:
+            # Workers presos não terminam sozinhos e bloqueariam a saída do interpretador
+            while not worker_pids.empty():
+                try:
+                    os.kill(worker_pids.get(), signal.SIGKILL)
+                except ProcessLookupError:
+                    pass
+        worker_pids.close()
+
+
+def summarize_fleet(results: Iterable[Dict]) -> Dict:
+    """Agrega os resultados por raiz em um resumo da frota."""
+    summary = {
+        "type": "summary",
+        "roots": 0,
+        "by_status": {},
+        "missing_components": {},
+        "incorrect_permissions": 0,
+        "roots_with_issues": [],
+        "slowest": None
+    }
+    slowest = 0.0
+
+    for result in results:
+        summary["roots"] += 1
+        status = result.get("status", "ERROR")
+        summary["by_status"][status] = summary["by_status"].get(status, 0) + 1
+
+        missing = result.get("audit", {}).get("missing_components", [])
+        for component in missing:
+            summary["missing_components"][component] = summary["missing_components"].get(component, 0) + 1
+
+        incorrect = len(result.get("inconsistencies", {}).get("incorrect_permissions", []))
+        summary["incorrect_permissions"] += incorrect
+
+        if status != "OK" or missing or incorrect:
+            summary["roots_with_issues"].append(result["root"])
+
+        elapsed = result.get("elapsed", 0.0)
+        if summary["slowest"] is None or elapsed > slowest:
+            slowest = elapsed
+            summary["slowest"] = {"root": result["root"], "elapsed": elapsed}
+
+    summary["roots_with_issues"].sort()
+    return summary
+
+
+def summarize_findings(action: str, findings: Iterable[Dict]) -> Dict:
+    """Consome um fluxo de achados e devolve apenas as contagens por tipo."""
+    counts = {}
+    for finding in findings:
+        counts[finding["type"]] = counts.get(finding["type"], 0) + 1
+    return {
+        "type": "summary",
+        "action": action,
+        "status": "ERROR" if counts.get("error") else "OK",
+        "counts": counts
+    }
+
+
+def main():
+    """Função principal"""
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description='SecretManagerAgent - Gestor de Secrets .J.4.R.V.1.5'
+    )
+    parser.add_argument('--action', default=None,
+                        choices=['audit', 'normalize_permissions', 'detect_inconsistencies', 'prepare_migration'],
+                        help='Ação a executar (padrão: audit)')
+    parser.add_argument('--secrets-path', default=None,
+                        help='Diretório de segredos (padrão: ~/.J.4.R.V.1.5/60_secrets)')
+    parser.add_argument('--ndjson', action='store_true',
+                        help='Emitir cada achado como uma linha JSON assim que for encontrado')
+    parser.add_argument('--summary-only', action='store_true',
+                        help='Emitir apenas o resumo com as contagens por tipo de achado')
+    parser.add_argument('--fleet', nargs='*', metavar='BASE',
+                        help=f'Auditar todas as raízes J4RV15 sob as bases (padrão: {" ".join(DEFAULT_FLEET_BASES)})')
+    parser.add_argument('--passwd', action='store_true',
+                        help='Incluir homes de todas as contas de /etc/passwd no modo fleet')
+    parser.add_argument('--workers', type=int, default=None,
+                        help='Número de processos do pool (modo fleet)')
+    parser.add_argument('--timeout', type=int, default=60,
+                        help='Tempo limite em segundos por raiz (modo fleet)')
+
+    args = parser.parse_args()
+
+    if args.fleet is not None:
+        # O modo fleet sempre executa audit + detect_inconsistencies e emite NDJSON
+        for flag, value in (('--action', args.action), ('--secrets-path', args.secrets_path),
+                            ('--ndjson', args.ndjson), ('--summary-only', args.summary_only)):
+            if value:
+                parser.error(f'{flag} não pode ser usado com --fleet')
+
+    if args.fleet is None:
+        agent = SecretManagerAgent(args.secrets_path)
+        action = args.action or 'audit'
+        task = {"action": action}
+
+        if not (args.ndjson or args.summary_only):
+            print(json.dumps(agent.run_task(task), indent=2))
+            return
+
+        # Streaming: memória constante, achados visíveis imediatamente
+        def emit(findings):
+            for finding in findings:
+                if args.ndjson:
+                    sys.stdout.write(json.dumps(finding) + "\n")
+                    sys.stdout.flush()
+                yield finding
+
+        summary = summarize_findings(action, emit(agent.iter_task(task)))
+        sys.stdout.write(json.dumps(summary) + "\n")
+        return
+
+    roots = discover_j4rv15_roots(args.fleet or DEFAULT_FLEET_BASES, include_passwd=args.passwd)
+
+    # Resultados por raiz em NDJSON à medida que concluem; resumo na última linha
+    def emit(results):
+        for result in results:
+            sys.stdout.write(json.dumps(result) + "\n")
+            sys.stdout.flush()
+            yield result
+
+    summary = summarize_fleet(emit(fleet_audit(roots, workers=args.workers, timeout=args.timeout)))
+    sys.stdout.write(json.dumps(summary) + "\n")
+
+
 if __name__ == "__main__":
-    agent = SecretManagerAgent()
-    
-    # Exemplo de uso
-    task = {"action": "audit"}
-    result = agent.run_task(task)
-    print(json.dumps(result, indent=2))
+    main()
@@ -0,0 +1,37 @@
+#!/usr/bin/env python3
+"""J4RV15 Core - Constantes e configurações base"""
+
+from pathlib import Path
+
+# Raiz do J4RV15 - EXATAMENTE como especificado
+J4RV15_ROOT = Path.home() / ".J.4.R.V.1.5"
+
+# Versão
+VERSION = "{{ version }}"
+
+# Estrutura canônica
+CANONICAL_DIRS = [
+    "00_.local",
+    "00_logs",
+    "01_saas_foundry",
+    "10_configs",
+    "20_workspace",
+    "30_knowledge",
+    "40_infrastructure",
+    "50_templates",
+    "60_secrets",
+    "70_media",
+    "80_bin",
+    "90_tmp",
+    "99_archive"
+]
+
+# Diretórios que precisam permissões especiais
+SECURE_DIRS = {
+    "60_secrets": 0o700,
+    "60_secrets/.ssh": 0o700,
+    "60_secrets/.gpg": 0o700,
+    "60_secrets/.env.d": 0o700,
+}
+
+print(f"J4RV15 Core v{VERSION} - Root: {J4RV15_ROOT}")
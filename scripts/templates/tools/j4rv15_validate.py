@@ -0,0 +1,36 @@
+#!/usr/bin/env python3
+"""J4RV15 Validate - Validação da estrutura"""
+
+from pathlib import Path
+from j4rv15_core import J4RV15_ROOT, CANONICAL_DIRS
+
+def validate_structure():
+    """Valida se a estrutura está correta"""
+    issues = []
+    
+    if not J4RV15_ROOT.exists():
+        issues.append(f"Root não existe: {J4RV15_ROOT}")
+        return issues
+    
+    for dir_name in CANONICAL_DIRS:
+        dir_path = J4RV15_ROOT / dir_name
+        if not dir_path.exists():
+            issues.append(f"Diretório faltando: {dir_name}")
+    
+    # Verificar permissões de 60_secrets
+    secrets_dir = J4RV15_ROOT / "60_secrets"
+    if secrets_dir.exists():
+        mode = secrets_dir.stat().st_mode & 0o777
+        if mode != 0o700:
+            issues.append(f"60_secrets com permissões incorretas: {oct(mode)}")
+    
+    return issues
+
+if __name__ == "__main__":
+    issues = validate_structure()
+    if issues:
+        print("❌ Problemas encontrados:")
+        for issue in issues:
+            print(f"  • {issue}")
+    else:
+        print("✅ Estrutura validada com sucesso!")
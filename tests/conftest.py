@@ -0,0 +1,6 @@
+"""Configuração comum dos testes: torna os scripts importáveis como módulos."""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "scripts"))
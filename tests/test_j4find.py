@@ -0,0 +1,93 @@
+"""Testes do índice incremental do j4find."""
+
+import multiprocessing
+import os
+
+import j4find
+from j4find import KnowledgeIndex
+
+
+def make_corpus(root):
+    notes = root / "30_knowledge" / "notes"
+    notes.mkdir(parents=True)
+    (notes / "kubernetes.md").write_text("Deploy de pods no cluster kubernetes\n")
+    (notes / "postgres.md").write_text("Backup do banco postgres com pg_dump\n")
+    return notes
+
+
+def test_incremental_update_writes_only_changes(tmp_path):
+    notes = make_corpus(tmp_path)
+    index = KnowledgeIndex(tmp_path)
+    try:
+        assert index.update() == {"indexed": 2, "unchanged": 0, "removed": 0}
+
+        changes = index.db.total_changes
+        assert index.update() == {"indexed": 0, "unchanged": 2, "removed": 0}
+        assert index.db.total_changes == changes
+
+        (notes / "postgres.md").write_text("Replicação lógica do postgres\n")
+        os.utime(notes / "postgres.md", ns=(1, 1))
+        (notes / "kubernetes.md").unlink()
+        (notes / "redis.md").write_text("Cache redis com TTL\n")
+        assert index.update() == {"indexed": 2, "unchanged": 0, "removed": 1}
+
+        assert [r["path"] for r in index.search("replicação postgres")] == [str(notes / "postgres.md")]
+        assert str(notes / "kubernetes.md") not in [r["path"] for r in index.search("kubernetes")]
+        assert index.search_names("redis")[0]["path"] == str(notes / "redis.md")
+    finally:
+        index.close()
+
+
+def test_old_schema_is_rebuilt(tmp_path):
+    make_corpus(tmp_path)
+    index = KnowledgeIndex(tmp_path)
+    index.update()
+    index.db.execute("PRAGMA user_version = 1")
+    index.close()
+
+    index = KnowledgeIndex(tmp_path)
+    try:
+        assert index.update()["indexed"] == 2
+    finally:
+        index.close()
+
+
+def _concurrent_update(root, barrier, results):
+    index = KnowledgeIndex(root)
+    try:
+        barrier.wait()
+        results.put(index.update())
+    except Exception as e:  # noqa: BLE001 - o erro é o resultado do teste
+        results.put(repr(e))
+    finally:
+        index.close()
+
+
+def test_concurrent_updaters_share_the_index(tmp_path, monkeypatch):
+    notes = tmp_path / "30_knowledge" / "notes"
+    notes.mkdir(parents=True)
+    for i in range(200):
+        (notes / f"nota{i:03}.md").write_text(f"nota numero{i} sobre backup e replicação\n")
+    # Commits intermediários frequentes: os dois processos se intercalam no lock
+    monkeypatch.setattr(j4find, "COMMIT_EVERY", 20)
+
+    ctx = multiprocessing.get_context("fork")
+    barrier = ctx.Barrier(2)
+    results = ctx.Queue()
+    workers = [ctx.Process(target=_concurrent_update, args=(tmp_path, barrier, results)) for _ in range(2)]
+    for worker in workers:
+        worker.start()
+    outcomes = [results.get(timeout=60) for _ in workers]
+    for worker in workers:
+        worker.join(timeout=60)
+
+    assert all(isinstance(outcome, dict) for outcome in outcomes), outcomes
+    assert sum(outcome["indexed"] for outcome in outcomes) == 200
+
+    index = KnowledgeIndex(tmp_path)
+    try:
+        assert index.update() == {"indexed": 0, "unchanged": 200, "removed": 0}
+        assert index.db.execute("SELECT COUNT(*) FROM docs").fetchone()[0] == 200
+        assert index.search("numero7")[0]["path"] == str(notes / "nota007.md")
+    finally:
+        index.close()
@@ -0,0 +1,62 @@
+"""Testes do cache de status do j4git contra repositórios gerados."""
+
+import shutil
+import subprocess
+
+import pytest
+
+from j4git import WorkspaceScanner
+
+pytestmark = pytest.mark.skipif(shutil.which("git") is None, reason="git não instalado")
+
+
+def git(cwd, *args):
+    subprocess.run(["git", "-c", "user.name=J4", "-c", "user.email=j4@example.invalid",
+                    "-c", "init.defaultBranch=main", *args],
+                   cwd=cwd, check=True, capture_output=True)
+
+
+@pytest.fixture
+def workspace(tmp_path):
+    remote = tmp_path / "remote.git"
+    git(tmp_path, "init", "--bare", str(remote))
+    repo = tmp_path / "root" / "20_workspace" / "current" / "proj"
+    repo.parent.mkdir(parents=True)
+    git(tmp_path, "clone", str(remote), str(repo))
+    (repo / "README.md").write_text("# proj\n")
+    git(repo, "add", "README.md")
+    git(repo, "commit", "-m", "init")
+    git(repo, "push", "-u", "origin", "main")
+    return tmp_path / "root", repo
+
+
+def test_push_invalidates_cached_ahead_count(workspace):
+    root, repo = workspace
+    scanner = WorkspaceScanner(root)
+
+    (repo / "notes.md").write_text("nota\n")
+    git(repo, "add", "notes.md")
+    git(repo, "commit", "-m", "notes")
+    [status] = scanner.scan()
+    assert (status["ahead"], status["cached"]) == (1, False)
+
+    [status] = scanner.scan()
+    assert (status["ahead"], status["cached"]) == (1, True)
+
+    git(repo, "push")
+    [status] = scanner.scan()
+    assert (status["ahead"], status["cached"]) == (0, False)
+    assert status["dirty"] is False
+
+
+def test_max_age_bounds_unseen_edits(workspace):
+    root, repo = workspace
+    WorkspaceScanner(root).scan()
+
+    # Edição sem `git add`: nenhum arquivo da chave muda
+    (repo / "README.md").write_text("# editado\n")
+    [status] = WorkspaceScanner(root).scan()
+    assert (status["dirty"], status["cached"]) == (False, True)
+
+    [status] = WorkspaceScanner(root, max_age=0).scan()
+    assert (status["dirty"], status["cached"]) == (True, False)
@@ -0,0 +1,181 @@
+"""Testes das seções do coletor nativo contra árvores de fixture."""
+
+import json
+import shutil
+import subprocess
+
+import pytest
+
+import j4rv15_collector
+from j4rv15_collector import _parse_keybox, _running_services, _packages, _secrets, _static_hardware
+
+
+def test_secrets_flags_root_and_nested_directory_permissions(tmp_path):
+    secrets = tmp_path / "60_secrets"
+    (secrets / ".keys").mkdir(parents=True)
+    (secrets / ".keys" / "api").write_text("token\n")
+    (secrets / ".keys" / "api").chmod(0o644)
+    (secrets / ".keys").chmod(0o700)
+    secrets.chmod(0o755)
+
+    result = _secrets(secrets)
+
+    assert result["inconsistencies"]["directories"] == [{"path": str(secrets), "mode": "0o755"}]
+    assert result["inconsistencies"]["files"] == [{"path": str(secrets / ".keys" / "api"), "mode": "0o644"}]
+
+
+def test_secrets_root_with_correct_mode_is_clean(tmp_path):
+    secrets = tmp_path / "60_secrets"
+    secrets.mkdir(mode=0o700)
+    secrets.chmod(0o700)
+
+    assert _secrets(secrets)["inconsistencies"] == {"files": [], "directories": []}
+
+
+@pytest.fixture
+def fake_hardware(monkeypatch):
+    """Substitui as leituras de /proc e /sys e conta quantas vezes o hardware foi sondado."""
+    state = {"boot_id": "boot-1", "probes": 0, "mounts": {"sda1": "/"}}
+
+    def disks():
+        state["probes"] += 1
+        return [{"name": "sda", "size_bytes": 512, "type": "disk", "model": "SSD",
+                 "partitions": [{"name": "sda1", "size_bytes": 512, "type": "part"}]}]
+
+    monkeypatch.setattr(j4rv15_collector, "_boot_id", lambda: state["boot_id"])
+    monkeypatch.setattr(j4rv15_collector, "_cpu_model", lambda: "CPU de teste")
+    monkeypatch.setattr(j4rv15_collector, "_gpus", lambda: [])
+    monkeypatch.setattr(j4rv15_collector, "_disks", disks)
+    monkeypatch.setattr(j4rv15_collector, "_mounts", lambda: dict(state["mounts"]))
+    return state
+
+
+def test_hardware_cache_hit_and_miss_on_boot_id(tmp_path, fake_hardware):
+    cache = tmp_path / "cache" / "hardware.json"
+
+    first = _static_hardware(cache)
+    assert first["cached"] is False and fake_hardware["probes"] == 1
+    assert "mountpoint" not in json.dumps(json.loads(cache.read_text()))
+
+    second = _static_hardware(cache)
+    assert second["cached"] is True and fake_hardware["probes"] == 1
+    assert second["cpu"]["model"] == "CPU de teste"
+
+    fake_hardware["boot_id"] = "boot-2"
+    third = _static_hardware(cache)
+    assert third["cached"] is False and fake_hardware["probes"] == 2
+    assert json.loads(cache.read_text())["boot_id"] == "boot-2"
+
+
+def test_hardware_cache_reads_mounts_on_every_run(tmp_path, fake_hardware):
+    cache = tmp_path / "hardware.json"
+    assert _static_hardware(cache)["disks"][0]["partitions"][0]["mountpoint"] == "/"
+
+    fake_hardware["mounts"] = {}
+    cached = _static_hardware(cache)
+    assert cached["cached"] is True
+    assert cached["disks"][0]["mountpoint"] is None
+    assert cached["disks"][0]["partitions"][0]["mountpoint"] is None
+
+
+def test_hardware_cache_from_older_format_is_ignored(tmp_path, fake_hardware):
+    cache = tmp_path / "hardware.json"
+    cache.write_text(json.dumps({"boot_id": "boot-1", "cpu": {}, "gpu": [], "disks": []}))
+
+    assert _static_hardware(cache)["cached"] is False
+    assert fake_hardware["probes"] == 1
+
+
+def _cgroup(path, procs="", populated=None):
+    path.mkdir(parents=True)
+    (path / "cgroup.procs").write_text(procs)
+    if populated is not None:
+        (path / "cgroup.events").write_text(f"populated {populated}\nfrozen 0\n")
+
+
+def test_running_services_descends_into_nested_slices(tmp_path, monkeypatch):
+    system = tmp_path / "system.slice"
+    _cgroup(system / "sshd.service", "412\n")
+    _cgroup(system / "stopped.service")
+    _cgroup(system / "system-getty.slice" / "getty@tty1.service", "733\n")
+    _cgroup(system / "system-getty.slice" / "getty@tty2.service")
+    # Serviço com Delegate=yes: processos só em um sub-cgroup
+    _cgroup(system / "docker.service")
+    _cgroup(system / "docker.service" / "init.scope", "901\n")
+    monkeypatch.setattr(j4rv15_collector, "CGROUP_SYSTEM_SLICES", [tmp_path / "missing", system])
+
+    assert _running_services() == ["docker.service", "getty@tty1.service", "sshd.service"]
+
+
+def test_running_services_prefers_cgroup_events(tmp_path, monkeypatch):
+    system = tmp_path / "system.slice"
+    _cgroup(system / "a.service", populated=1)
+    _cgroup(system / "b.service", "12\n", populated=0)
+    monkeypatch.setattr(j4rv15_collector, "CGROUP_SYSTEM_SLICES", [system])
+
+    assert _running_services() == ["a.service"]
+
+
+def test_packages_from_pacman_db(tmp_path, monkeypatch):
+    db = tmp_path / "local"
+    for name in ("bash-5.2-1", "git-2.44-1"):
+        (db / name).mkdir(parents=True)
+    (db / "ALPM_DB_VERSION").write_text("9\n")
+    monkeypatch.setattr(j4rv15_collector, "PACMAN_DB", db)
+
+    assert _packages() == {"manager": "pacman", "count": 2}
+
+
+def test_packages_from_dpkg_status(tmp_path, monkeypatch):
+    status = tmp_path / "status"
+    status.write_text(
+        "Package: bash\nStatus: install ok installed\n\n"
+        "Package: old\nStatus: deinstall ok config-files\n\n"
+        "Package: git\nStatus: install ok installed\n"
+    )
+    monkeypatch.setattr(j4rv15_collector, "PACMAN_DB", tmp_path / "missing")
+    monkeypatch.setattr(j4rv15_collector, "DPKG_STATUS", status)
+
+    assert _packages() == {"manager": "dpkg", "count": 2}
+
+
+@pytest.mark.skipif(shutil.which("gpg") is None, reason="gpg não instalado")
+def test_parse_keybox_matches_gpg(tmp_path):
+    gnupg_home = tmp_path / "gnupg"
+    gnupg_home.mkdir(mode=0o700)
+    env = {"GNUPGHOME": str(gnupg_home), "PATH": "/usr/bin:/bin"}
+    try:
+        for uid in ("Primeira <um@example.invalid>", "Segunda <dois@example.invalid>"):
+            subprocess.run(["gpg", "--batch", "--passphrase", "", "--quick-gen-key",
+                            uid, "default", "default", "never"],
+                           env=env, check=True, capture_output=True)
+        listing = subprocess.run(["gpg", "--with-colons", "--list-keys"],
+                                 env=env, check=True, capture_output=True, text=True).stdout
+    finally:
+        subprocess.run(["gpgconf", "--kill", "all"], env=env, capture_output=True)
+
+    # Em --with-colons, a linha fpr logo após pub é da chave primária; após sub, da subchave
+    expected = {}
+    primary = None
+    previous = None
+    for line in listing.splitlines():
+        fields = line.split(":")
+        if fields[0] == "fpr" and previous == "pub":
+            primary = fields[9]
+            expected[primary] = {"subkeys": [], "uids": []}
+        elif fields[0] == "fpr" and previous == "sub":
+            expected[primary]["subkeys"].append(fields[9])
+        elif fields[0] == "uid":
+            expected[primary]["uids"].append(fields[9])
+        previous = fields[0]
+
+    keys = _parse_keybox((gnupg_home / "pubring.kbx").read_bytes())
+
+    assert {k["fingerprint"]: {"subkeys": k["subkeys"], "uids": k["uids"]} for k in keys} == expected
+
+
+def test_parse_keybox_stops_at_truncated_blob():
+    header = (32).to_bytes(4, "big") + bytes([1, 1]) + bytes(26)
+    truncated = (4096).to_bytes(4, "big") + bytes([2, 1]) + bytes(30)
+
+    assert _parse_keybox(header + truncated) == []
@@ -0,0 +1,126 @@
+"""Testes do motor de scaffolding."""
+
+import errno
+import os
+import sys
+
+import pytest
+
+from j4scaffold import ScaffoldEngine, ScaffoldError, main
+
+
+@pytest.fixture
+def engine(tmp_path):
+    return ScaffoldEngine(tmp_path, cache_dir=tmp_path / "cache")
+
+
+def make_template(tmp_path, files):
+    template = tmp_path / "50_templates" / "configs" / "chart"
+    for rel, content in files.items():
+        path = template / rel
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(content)
+    return template
+
+
+def test_renders_variables_in_content_and_paths(tmp_path, engine):
+    template = make_template(tmp_path, {
+        "{{ name }}/README.md": "# {{ name }} ({{year}})\n",
+        "static.txt": "sem variáveis\n",
+    })
+    dest = tmp_path / "out" / "demo"
+
+    result = engine.instantiate(template, dest, {"year": "2026"}, link_mode="copy")
+
+    assert (dest / "demo" / "README.md").read_text() == "# demo (2026)\n"
+    assert (dest / "static.txt").read_text() == "sem variáveis\n"
+    assert result["rendered"] == 1 and result["copy"] == 1
+
+
+def test_escaped_placeholders_are_literal(tmp_path, engine):
+    template = make_template(tmp_path, {
+        "templates/deployment.yaml": "name: {{ name }}\n{{- if .Values.on }}\nx\n\\{{ end }}\n",
+    })
+    dest = tmp_path / "out" / "app"
+
+    engine.instantiate(template, dest, {})
+
+    assert (dest / "templates" / "deployment.yaml").read_text() == \
+        "name: app\n{{- if .Values.on }}\nx\n{{ end }}\n"
+
+
+@pytest.mark.parametrize("value", ["../../escape", "/tmp/escape"])
+def test_path_variables_cannot_leave_dest(tmp_path, engine, value):
+    template = make_template(tmp_path, {"{{ module }}/main.py": "print('x')\n"})
+    dest = tmp_path / "out" / "proj"
+
+    with pytest.raises(ScaffoldError, match="Path traversal"):
+        engine.instantiate(template, dest, {"module": value})
+
+    assert not dest.exists()
+    assert not (tmp_path / "escape").exists()
+
+
+def test_missing_variable_writes_nothing(tmp_path, engine):
+    template = make_template(tmp_path, {"a.txt": "{{ undefined_var }}\n"})
+    dest = tmp_path / "out" / "proj"
+
+    with pytest.raises(ScaffoldError, match="undefined_var"):
+        engine.instantiate(template, dest, {})
+    assert not dest.exists()
+
+
+def test_non_empty_destination_requires_overwrite(tmp_path, engine):
+    template = make_template(tmp_path, {"README.md": "# {{ name }}\n"})
+    dest = tmp_path / "out" / "proj"
+    dest.mkdir(parents=True)
+    (dest / "README.md").write_text("notas do usuário\n")
+
+    with pytest.raises(ScaffoldError, match="não está vazio"):
+        engine.instantiate(template, dest, {})
+    assert (dest / "README.md").read_text() == "notas do usuário\n"
+
+    engine.instantiate(template, dest, {}, overwrite=True)
+    assert (dest / "README.md").read_text() == "# proj\n"
+
+
+def test_empty_destination_is_accepted(tmp_path, engine):
+    template = make_template(tmp_path, {"README.md": "# {{ name }}\n"})
+    dest = tmp_path / "out" / "proj"
+    dest.mkdir(parents=True)
+
+    engine.instantiate(template, dest, {})
+    assert (dest / "README.md").read_text() == "# proj\n"
+
+
+def test_cli_refuses_existing_project_without_force(tmp_path, monkeypatch, capsys):
+    make_template(tmp_path, {"README.md": "# {{ name }}\n"})
+    dest = tmp_path / "20_workspace" / "current" / "proj"
+    dest.mkdir(parents=True)
+    (dest / "README.md").write_text("notas do usuário\n")
+    argv = ["j4scaffold.py", "chart", "proj", "--root", str(tmp_path)]
+
+    monkeypatch.setattr(sys, "argv", argv)
+    assert main() == 1
+    assert "--force" in capsys.readouterr().err
+    assert (dest / "README.md").read_text() == "notas do usuário\n"
+
+    monkeypatch.setattr(sys, "argv", argv + ["--force"])
+    assert main() == 0
+    assert (dest / "README.md").read_text() == "# proj\n"
+
+
+@pytest.mark.parametrize("broken", ["copy_file_range", "both"])
+def test_copy_falls_back_when_kernel_copy_is_unsupported(tmp_path, engine, monkeypatch, broken):
+    def unsupported(*args):
+        raise OSError(errno.EXDEV, "cross-device")
+
+    monkeypatch.setattr(os, "copy_file_range", unsupported)
+    if broken == "both":
+        monkeypatch.setattr(os, "sendfile", unsupported)
+    content = "x" * 100_000 + "\n"
+    template = make_template(tmp_path, {"big.txt": content})
+    dest = tmp_path / "out" / "proj"
+
+    assert engine.instantiate(template, dest, {}, link_mode="copy")["copy"] == 1
+    assert (dest / "big.txt").read_text() == content
@@ -0,0 +1,54 @@
+"""Testes de fumaça do harness de stress (janelas curtas)."""
+
+import fcntl
+import os
+from contextlib import contextmanager
+
+import pytest
+
+import j4stress
+from j4stress import run_stress
+
+
+@contextmanager
+def flock_without_unlink(path, exclusive=True):
+    """Lock correto: o arquivo .lock nunca é removido, então todos travam o mesmo inode."""
+    fd = os.open(f"{path}.lock", os.O_RDWR | os.O_CREAT, 0o600)
+    try:
+        fcntl.flock(fd, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+        yield fd
+    finally:
+        fcntl.flock(fd, fcntl.LOCK_UN)
+        os.close(fd)
+
+
+@contextmanager
+def no_lock(path, exclusive=True):
+    yield None
+
+
+def test_report_shape_and_pass_with_correct_lock(tmp_path, monkeypatch):
+    monkeypatch.setattr(j4stress, "file_lock", flock_without_unlink)
+
+    report = run_stress(tmp_path, writers=2, readers=1, lockers=2, duration=0.5, payload_size=256)
+
+    assert set(report) == {"timestamp", "version", "config", "results", "violations", "passed"}
+    assert set(report["results"]) == {"atomic_write", "read", "file_lock"}
+    for kind, result in report["results"].items():
+        assert result["ops"] > 0, kind
+        assert result["elapsed"] >= 0.4
+        assert result["ops_per_sec"] == pytest.approx(result["ops"] / result["elapsed"], rel=1e-3)
+        assert set(result["latency_ms"]) == {"p50", "p95", "p99", "max"}
+    assert report["violations"] == {"torn_reads": 0, "lost_updates": 0, "leftover_tmp": 0, "double_holders": 0}
+    assert report["passed"] is True
+    assert int((tmp_path / j4stress.STRESS_DIR / "counter").read_text()) == report["results"]["file_lock"]["ops"]
+
+
+def test_broken_lock_is_detected(tmp_path, monkeypatch):
+    monkeypatch.setattr(j4stress, "file_lock", no_lock)
+
+    report = run_stress(tmp_path, writers=0, readers=0, lockers=4, duration=1.0)
+
+    assert report["violations"]["double_holders"] > 0
+    assert report["violations"]["lost_updates"] > 0
+    assert report["passed"] is False
@@ -0,0 +1,128 @@
+"""Testes de ida e volta do j4tier (pack -> ls -> hydrate)."""
+
+import json
+import os
+import stat
+import time
+from pathlib import Path
+
+import pytest
+
+import j4tier
+from j4tier import STUB_SUFFIX, TierError, hydrate, list_bundle, pack, read_member
+
+OLD = time.time() - 200 * 86400
+
+
+def make_project(root):
+    project = root / "20_workspace" / "current" / "proj"
+    (project / "sub" / "deep").mkdir(parents=True)
+    (project / "README.md").write_text("# proj\n")
+    (project / "sub" / "data.bin").write_bytes(os.urandom(4096))
+    (project / "sub" / "deep" / "run.sh").write_text("#!/bin/sh\necho ok\n")
+    (project / "sub" / "deep" / "run.sh").chmod(0o750)
+    (project / "link_to_dir").symlink_to("sub")
+    (project / "link_to_file").symlink_to("README.md")
+    (project / "dangling").symlink_to("missing")
+    for dir_path, dirs, files in os.walk(project, topdown=False):
+        for name in files + dirs:
+            os.utime(os.path.join(dir_path, name), (OLD, OLD), follow_symlinks=False)
+    os.utime(project, (OLD, OLD))
+    # O ctime não pode ser recuado: aguardar a margem da checagem de mudanças
+    time.sleep(1.1)
+    return project
+
+
+def snapshot(project):
+    tree = {}
+    for dir_path, dirs, files in os.walk(project):
+        for name in dirs + files:
+            path = Path(dir_path) / name
+            st = path.lstat()
+            rel = str(path.relative_to(project))
+            if stat.S_ISLNK(st.st_mode):
+                tree[rel] = ("symlink", os.readlink(path))
+            elif stat.S_ISDIR(st.st_mode):
+                tree[rel] = ("dir", stat.S_IMODE(st.st_mode), int(st.st_mtime))
+            else:
+                tree[rel] = ("file", stat.S_IMODE(st.st_mode), int(st.st_mtime), path.read_bytes())
+    return tree
+
+
+def test_pack_ls_hydrate_round_trip(tmp_path):
+    project = make_project(tmp_path)
+    before = snapshot(project)
+
+    result = pack(str(project), str(tmp_path))
+    stub = Path(result["stub"])
+    assert not project.exists()
+    assert stub.name == "proj" + STUB_SUFFIX
+
+    listed = {entry["path"] for entry in list_bundle(str(stub))}
+    assert listed == {"README.md", "dangling", "link_to_dir", "link_to_file",
+                      "sub/data.bin", "sub/deep/run.sh"}
+    assert read_member(str(stub), "sub/deep/run.sh") == b"#!/bin/sh\necho ok\n"
+
+    hydrate(str(stub))
+    assert not stub.exists()
+    assert not Path(result["bundle"]).exists()
+    assert snapshot(project) == before
+
+
+def test_pack_aborts_when_subtree_changes(tmp_path, monkeypatch):
+    project = make_project(tmp_path)
+    original_zip_info = j4tier._zip_info
+
+    def zip_info_with_concurrent_write(arcname, st):
+        (project / "sub" / "new-note.md").write_text("escrito durante o pack\n")
+        return original_zip_info(arcname, st)
+
+    monkeypatch.setattr(j4tier, "_zip_info", zip_info_with_concurrent_write)
+    with pytest.raises(TierError, match="modificada"):
+        pack(str(project), str(tmp_path))
+
+    assert (project / "sub" / "new-note.md").read_text() == "escrito durante o pack\n"
+    assert not project.with_name("proj" + STUB_SUFFIX).exists()
+    assert list((tmp_path / "99_archive" / "old" / "current").iterdir()) == []
+
+
+def test_round_trip_through_symlinked_root(tmp_path):
+    real = tmp_path / "real"
+    real.mkdir()
+    root = tmp_path / "link"
+    root.symlink_to(real)
+    project = make_project(root)
+    before = snapshot(project)
+
+    result = pack(str(project), str(root))
+    hydrate(result["stub"])
+
+    assert snapshot(project) == before
+
+
+def test_relative_root_stores_absolute_paths(tmp_path, monkeypatch):
+    project = make_project(tmp_path)
+    before = snapshot(project)
+    monkeypatch.chdir(tmp_path)
+
+    result = pack(str(project.relative_to(tmp_path)), ".")
+    stub = json.loads(Path(result["stub"]).read_text())
+    assert Path(stub["source"]) == project
+    assert Path(stub["bundle"]).is_absolute()
+
+    monkeypatch.chdir("/")
+    hydrate(str(project.with_name("proj" + STUB_SUFFIX)))
+    assert snapshot(project) == before
+
+
+def test_pack_refuses_to_overwrite_existing_stub(tmp_path):
+    project = make_project(tmp_path)
+    stub = project.with_name("proj" + STUB_SUFFIX)
+    stub.write_text('{"bundle": "bundle-anterior.j4z"}\n')
+
+    with pytest.raises(TierError, match="Stub já existe"):
+        pack(str(project), str(tmp_path))
+
+    assert stub.read_text() == '{"bundle": "bundle-anterior.j4z"}\n'
+    assert project.is_dir()
+    assert not (tmp_path / "99_archive").exists()
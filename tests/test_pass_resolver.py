@@ -0,0 +1,166 @@
+"""Testes do PassResolver contra um keyring e um cofre descartáveis."""
+
+import ctypes
+import mmap
+import shutil
+import subprocess
+
+import pytest
+
+import pass_resolver
+from pass_resolver import PassResolver, PassResolverError, _LockedBuffer, wipe
+
+pytestmark = pytest.mark.skipif(shutil.which("gpg") is None, reason="gpg não instalado")
+
+SECRETS = {
+    "J4RV15/api/openai": b"sk-openai\nuser: bot\n",
+    "J4RV15/database/postgres": b"postgres://db\n",
+}
+
+
+@pytest.fixture(scope="module")
+def vault(tmp_path_factory):
+    """Keyring sem senha e cofre com entradas cifradas para ele."""
+    base = tmp_path_factory.mktemp("vault")
+    gnupg_home = base / "gnupg"
+    gnupg_home.mkdir(mode=0o700)
+    env = {"GNUPGHOME": str(gnupg_home), "PATH": "/usr/bin:/bin"}
+    subprocess.run(["gpg", "--batch", "--passphrase", "", "--quick-gen-key",
+                    "j4rv15-test@example.invalid", "default", "default", "never"],
+                   env=env, check=True, capture_output=True)
+
+    store = base / "store"
+    for name, value in SECRETS.items():
+        target = store / f"{name}.gpg"
+        target.parent.mkdir(parents=True, exist_ok=True)
+        subprocess.run(["gpg", "--batch", "--yes", "--trust-model", "always", "--encrypt",
+                        "--recipient", "j4rv15-test@example.invalid", "--output", str(target)],
+                       input=value, env=env, check=True, capture_output=True)
+    yield store, gnupg_home
+    subprocess.run(["gpgconf", "--kill", "all"], env=env, capture_output=True)
+
+
+def test_resolve_batch_and_cache(vault):
+    store, gnupg_home = vault
+    resolver = PassResolver(str(store), gnupg_home=str(gnupg_home))
+    try:
+        with resolver.secrets(SECRETS) as values:
+            assert {name: bytes(value) for name, value in values.items()} == SECRETS
+            assert all(isinstance(value, bytearray) for value in values.values())
+        assert all(not any(value) for value in values.values())
+        assert len(resolver.cache) == 2
+
+        # Segunda resolução vem do cache, sem gpg
+        resolver.gpg = "/nonexistent/gpg"
+        values = resolver.resolve(["J4RV15/database/postgres"])
+        assert bytes(values["J4RV15/database/postgres"]) == SECRETS["J4RV15/database/postgres"]
+        wipe(values["J4RV15/database/postgres"])
+    finally:
+        resolver.close()
+    assert len(resolver.cache) == 0
+
+
+def test_render_env_uses_first_line(vault):
+    store, gnupg_home = vault
+    resolver = PassResolver(str(store), gnupg_home=str(gnupg_home))
+    try:
+        content = resolver.render_env({"OPENAI": "J4RV15/api/openai", "DB": "J4RV15/database/postgres"})
+        assert bytes(content) == b"OPENAI=sk-openai\nDB=postgres://db\n"
+        with pytest.raises(PassResolverError):
+            resolver.render_env({"OPENAI": "J4RV15/api/openai"}, full=True)
+    finally:
+        resolver.close()
+
+
+def test_refuses_without_tmpfs(vault, monkeypatch, tmp_path):
+    store, gnupg_home = vault
+    monkeypatch.delenv("XDG_RUNTIME_DIR", raising=False)
+    monkeypatch.setattr(pass_resolver, "SHM_DIR", str(tmp_path / "missing"))
+    resolver = PassResolver(str(store), gnupg_home=str(gnupg_home))
+    with pytest.raises(PassResolverError, match="tmpfs"):
+        resolver.resolve(["J4RV15/api/openai"])
+
+
+def test_path_traversal_is_rejected(vault):
+    store, gnupg_home = vault
+    resolver = PassResolver(str(store), gnupg_home=str(gnupg_home))
+    with pytest.raises(PassResolverError, match="traversal"):
+        resolver.resolve(["../../etc/passwd"])
+
+
+_REAL_LIBC = pass_resolver._libc
+
+
+class _RecordingLibc:
+    """Envolve mlock/munlock da libc e guarda o conteúdo de cada região destravada."""
+
+    def __init__(self, mlock_result=None):
+        self.mlock_result = mlock_result
+        self.unlocked = []
+
+    def mlock(self, address, length):
+        if self.mlock_result is not None:
+            return self.mlock_result
+        return _REAL_LIBC.mlock(address, length)
+
+    def munlock(self, address, length):
+        self.unlocked.append((address, length, ctypes.string_at(address, length)))
+        return _REAL_LIBC.munlock(address, length)
+
+
+def _locked_kb(address):
+    """Campo Locked do /proc/self/smaps para o mapeamento que começa em address."""
+    with open("/proc/self/smaps") as f:
+        inside = False
+        for line in f:
+            if "-" in line.split(" ", 1)[0]:
+                inside = int(line.split("-", 1)[0], 16) == address
+            elif inside and line.startswith("Locked:"):
+                return int(line.split()[1])
+    return None
+
+
+def test_locked_buffer_is_zeroed_on_wipe(tmp_path, monkeypatch):
+    libc = _RecordingLibc()
+    monkeypatch.setattr(pass_resolver, "_libc", libc)
+    path = tmp_path / "plain"
+    path.write_bytes(b"top-secret")
+    with open(path, "rb") as f:
+        buf = _LockedBuffer.from_fd(f.fileno(), 10)
+    assert bytes(buf.copy()) == b"top-secret"
+    buf.wipe()
+    if buf.locked:
+        [(address, length, content)] = libc.unlocked
+        assert content == bytes(length)
+    assert buf._map is None
+
+
+def test_locked_buffers_use_their_own_pages():
+    first, second = _LockedBuffer(10), _LockedBuffer(10)
+    try:
+        for buf in (first, second):
+            assert buf._address % mmap.PAGESIZE == 0
+            assert len(buf._map) == mmap.PAGESIZE
+        if not (first.locked and second.locked):
+            pytest.skip("RLIMIT_MEMLOCK não permite mlock")
+        first.wipe()
+        # Liberar um buffer não pode destravar o vizinho
+        assert _locked_kb(second._address) == mmap.PAGESIZE // 1024
+    finally:
+        first.wipe()
+        second.wipe()
+
+
+def test_locked_buffer_warns_when_mlock_fails(monkeypatch):
+    monkeypatch.setattr(pass_resolver, "_libc", _RecordingLibc(mlock_result=-1))
+    with pytest.warns(RuntimeWarning, match="mlock"):
+        buf = _LockedBuffer(10)
+    assert buf.locked is False
+    buf.wipe()
+
+
+def test_missing_gpg_binary_raises_resolver_error(vault):
+    store, gnupg_home = vault
+    resolver = PassResolver(str(store), gnupg_home=str(gnupg_home), gpg="/nonexistent/gpg")
+    with pytest.raises(PassResolverError, match="/nonexistent/gpg"):
+        resolver.resolve(["J4RV15/api/openai"])
@@ -0,0 +1,87 @@
+"""Testes do modo fleet do SecretManagerAgent contra raízes temporárias."""
+
+import os
+import signal
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import secret_manager_agent
+from secret_manager_agent import (
+    J4RV15_DIRNAME, discover_j4rv15_roots, fleet_audit, summarize_fleet
+)
+
+
+def make_root(home, components=(".env", ".keys", ".ssh"), file_mode=0o600):
+    secrets = home / J4RV15_DIRNAME / "60_secrets"
+    secrets.mkdir(parents=True)
+    for component in components:
+        (secrets / component).mkdir()
+        secret_file = secrets / component / "token"
+        secret_file.write_text("s3cr3t\n")
+        secret_file.chmod(file_mode)
+    return home / J4RV15_DIRNAME
+
+
+def _hanging_audit(root, timeout):
+    """Simula um worker preso em syscall ininterruptível: ignora o SIGALRM."""
+    if root.endswith(os.path.join("stuck", J4RV15_DIRNAME)):
+        signal.signal(signal.SIGALRM, signal.SIG_IGN)
+        time.sleep(60)
+    return {"type": "root", "root": root, "status": "OK", "elapsed": 0.0}
+
+
+def test_discover_roots_in_base_and_one_level_below(tmp_path):
+    make_root(tmp_path / "alice")
+    make_root(tmp_path / "bob")
+    (tmp_path / "carol").mkdir()
+    (tmp_path / "alias").symlink_to(tmp_path / "alice")
+
+    roots = discover_j4rv15_roots([str(tmp_path), str(tmp_path / "missing")])
+
+    assert roots == [str(tmp_path / "alice" / J4RV15_DIRNAME), str(tmp_path / "bob" / J4RV15_DIRNAME)]
+
+
+def test_fleet_audit_and_summary(tmp_path):
+    complete = make_root(tmp_path / "complete", components=(
+        ".certificates", ".env", ".env.d", ".gpg", ".keys", ".passwords", ".tokens", ".ssh"))
+    partial = make_root(tmp_path / "partial", file_mode=0o644)
+
+    results = list(fleet_audit([str(complete), str(partial)], workers=2, timeout=10))
+    by_root = {r["root"]: r for r in results}
+
+    assert by_root[str(complete)]["status"] == "OK"
+    assert by_root[str(complete)]["audit"]["missing_components"] == []
+    assert len(by_root[str(partial)]["inconsistencies"]["incorrect_permissions"]) == 3
+
+    summary = summarize_fleet(results)
+    assert summary["roots"] == 2
+    assert summary["by_status"] == {"OK": 2}
+    assert summary["incorrect_permissions"] == 3
+    assert summary["missing_components"][".gpg"] == 1
+    assert summary["roots_with_issues"] == [str(partial)]
+
+
+def test_fleet_deadline_reports_stuck_root(tmp_path, monkeypatch):
+    monkeypatch.setattr(secret_manager_agent, "audit_root", _hanging_audit)
+    monkeypatch.setattr(secret_manager_agent, "FLEET_DEADLINE_GRACE", 1)
+    healthy = make_root(tmp_path / "healthy")
+    stuck = make_root(tmp_path / "stuck")
+
+    started = time.monotonic()
+    results = list(fleet_audit([str(healthy), str(stuck)], workers=2, timeout=1))
+    elapsed = time.monotonic() - started
+
+    assert elapsed < 10
+    assert {r["root"]: r["status"] for r in results} == {str(healthy): "OK", str(stuck): "TIMEOUT"}
+    assert summarize_fleet(results)["by_status"] == {"OK": 1, "TIMEOUT": 1}
+
+
+def test_fleet_rejects_single_root_flags(tmp_path):
+    script = Path(secret_manager_agent.__file__)
+    for extra in (["--ndjson"], ["--summary-only"], ["--action", "normalize_permissions"]):
+        process = subprocess.run([sys.executable, str(script), "--fleet", str(tmp_path), *extra],
+                                 capture_output=True, text=True)
+        assert process.returncode == 2
+        assert "--fleet" in process.stderr
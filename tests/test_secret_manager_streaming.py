@@ -0,0 +1,59 @@
+"""Testes da API em streaming do SecretManagerAgent e dos resultados em dicionário."""
+
+from pathlib import Path
+
+from secret_manager_agent import SecretManagerAgent, summarize_findings
+
+
+def make_secrets(tmp_path):
+    secrets = tmp_path / "60_secrets"
+    (secrets / ".keys").mkdir(parents=True)
+    (secrets / ".keys" / "api").write_text("token\n")
+    (secrets / ".keys" / "api").chmod(0o644)
+    # Modo explícito: importar j4rv15_brutalist muda o umask do processo de teste
+    (secrets / ".keys").chmod(0o755)
+    return secrets
+
+
+def test_normalize_permissions_streams_and_applies(tmp_path):
+    secrets = make_secrets(tmp_path)
+    agent = SecretManagerAgent(str(secrets))
+
+    findings = list(agent.iter_task({"action": "normalize_permissions"}))
+
+    assert {f["type"] for f in findings} == {"normalized"}
+    assert (secrets / ".keys" / "api").stat().st_mode & 0o777 == 0o600
+    assert summarize_findings("normalize_permissions", findings)["status"] == "OK"
+
+
+def test_chmod_errors_are_surfaced_in_run_task(tmp_path, monkeypatch):
+    secrets = make_secrets(tmp_path)
+    agent = SecretManagerAgent(str(secrets))
+
+    def failing_chmod(self, mode):
+        raise PermissionError(1, "Operation not permitted", str(self))
+
+    monkeypatch.setattr(Path, "chmod", failing_chmod)
+    result = agent.run_task({"action": "normalize_permissions"})
+
+    assert result["status"] == "ERROR"
+    assert [e["path"] for e in result["errors"]] == [str(secrets / ".keys"), str(secrets / ".keys" / "api")]
+    assert result["normalized_items"] == []
+
+
+def test_stat_errors_are_surfaced_in_detect_inconsistencies(tmp_path, monkeypatch):
+    secrets = make_secrets(tmp_path)
+    agent = SecretManagerAgent(str(secrets))
+    original_stat = Path.stat
+
+    def failing_stat(self, *, follow_symlinks=True):
+        if self.name == "api" and follow_symlinks:
+            raise PermissionError(13, "Permission denied", str(self))
+        return original_stat(self, follow_symlinks=follow_symlinks)
+
+    monkeypatch.setattr(Path, "stat", failing_stat)
+    result = agent.run_task({"action": "detect_inconsistencies"})
+
+    assert result["status"] == "ERROR"
+    assert result["errors"][0]["path"] == str(secrets / ".keys" / "api")
+    assert result["inconsistencies"]["incorrect_permissions"] == []